@@ -0,0 +1,39 @@
+"""hot_query_indexes
+
+Revision ID: d4f1a8c3e527
+Revises: c7a2f9d41e68
+Create Date: 2026-10-18 21:04:37.519826
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f1a8c3e527'
+down_revision: str | Sequence[str] | None = 'c7a2f9d41e68'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY can not run inside a transaction, writers are not
+    # blocked while the indexes are built
+    with op.get_context().autocommit_block():
+        op.create_index('ix_event_starts_at_id', 'event', ['starts_at', 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_event_participant_event_id_status', 'event_participant', ['event_id', 'status'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_event_participant_user_id', 'event_participant', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_event_participant_reminder_pending', 'event_participant', ['event_id'], unique=False, postgresql_where=sa.text("status = 'PARTICIPATING' AND reminder_queued_at IS NULL"), postgresql_concurrently=True)
+        op.create_index('ix_instant_notification_recipient_id_created_at', 'instant_notification', ['recipient_id', 'created_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_instant_notification_recipient_id_created_at', table_name='instant_notification', postgresql_concurrently=True)
+        op.drop_index('ix_event_participant_reminder_pending', table_name='event_participant', postgresql_concurrently=True)
+        op.drop_index('ix_event_participant_user_id', table_name='event_participant', postgresql_concurrently=True)
+        op.drop_index('ix_event_participant_event_id_status', table_name='event_participant', postgresql_concurrently=True)
+        op.drop_index('ix_event_starts_at_id', table_name='event', postgresql_concurrently=True)
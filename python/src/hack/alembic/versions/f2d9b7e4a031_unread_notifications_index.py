@@ -0,0 +1,29 @@
+"""unread_notifications_index
+
+Revision ID: f2d9b7e4a031
+Revises: e8b3c5a1f264
+Create Date: 2026-10-18 23:48:15.207341
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2d9b7e4a031'
+down_revision: str | Sequence[str] | None = 'e8b3c5a1f264'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_instant_notification_unread', 'instant_notification', ['recipient_id', 'created_at'], unique=False, postgresql_where=sa.text('acked_at IS NULL'), postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_instant_notification_unread', table_name='instant_notification', postgresql_concurrently=True)
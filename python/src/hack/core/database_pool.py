@@ -0,0 +1,73 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+
+class MeteredAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool which measures how long checkouts take.
+
+    The time includes waiting for a free connection, opening a new one
+    and the pre-ping.  Metrics survive `recreate`, which is how engine
+    disposal replaces the pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self) -> "MeteredAsyncQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self) -> PoolProxiedConnection:
+        metrics = self.metrics
+        metrics.waiting += 1
+        started_at = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            raise
+        finally:
+            metrics.waiting -= 1
+
+        wait_seconds = time.perf_counter() - started_at
+        metrics.checkouts += 1
+        metrics.wait_seconds_total += wait_seconds
+        metrics.wait_seconds_max = max(metrics.wait_seconds_max, wait_seconds)
+        return connection
+
+    def stats(self) -> dict[str, float]:
+        metrics = self.metrics
+        capacity = self.size() + max(self._max_overflow, 0)
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "waiting": metrics.waiting,
+            "saturation": (
+                self.checkedout() / capacity
+                if capacity
+                else 0.0
+            ),
+            "checkouts": metrics.checkouts,
+            "timeouts": metrics.timeouts,
+            "wait_seconds_avg": (
+                metrics.wait_seconds_total / metrics.checkouts
+                if metrics.checkouts
+                else 0.0
+            ),
+            "wait_seconds_max": metrics.wait_seconds_max,
+        }
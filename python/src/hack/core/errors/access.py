@@ -34,3 +34,9 @@ class ErrorRegistrationRateLimited(ServiceAccessError):
     def __init__(self, retry_after: int):
         super().__init__("Registration verification rate limit exceeded")
         self.retry_after = retry_after
+
+
+class ErrorPasswordHashingOverloaded(ServiceAccessError):
+    def __init__(self, retry_after: int):
+        super().__init__("Password hashing queue is saturated")
+        self.retry_after = retry_after
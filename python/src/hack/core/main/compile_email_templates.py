@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+from hack.core.services.email_factory import compile_email_templates
+
+DEFAULT_TARGET = "templates/email.zip"
+
+
+def main():
+    target = Path(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TARGET)
+    compile_email_templates(target)
+    print(f"Email templates compiled into {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,14 @@ from .login_session import LoginSession
 from .issued_login_recovery import IssuedLoginRecovery
 from .event import Event, EventParticipant
 from .instant_notification import InstantNotification
+from .outbox_message import OutboxMessage
+from .export_job import ExportJob, ExportJobStatusEnum
+from .statistics_snapshot import StatisticsSnapshot
+from .statistics_counters import (
+    StatisticsCounter,
+    StatisticsDailyRollup,
+    StatisticsUserParticipations,
+)
 from .notification_events import (
     NotificationEvent,
     NotificationEventTypeEnum,
@@ -29,6 +37,13 @@ __all__ = [
     "Event",
     "EventParticipant",
     "InstantNotification",
+    "OutboxMessage",
+    "ExportJob",
+    "ExportJobStatusEnum",
+    "StatisticsSnapshot",
+    "StatisticsCounter",
+    "StatisticsDailyRollup",
+    "StatisticsUserParticipations",
     "NotificationEvent",
     "NotificationEventTypeEnum",
     "RenderedEmail",
@@ -4,7 +4,14 @@ from datetime import datetime, timezone
 from enum import StrEnum
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Text, UniqueConstraint
+from sqlalchemy import (
+    ForeignKey,
+    Index,
+    Text,
+    UniqueConstraint,
+    false,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, CreatedAt
@@ -19,8 +26,34 @@ class EventStatusEnum(StrEnum):
     REJECTED = "REJECTED"
 
 
+def compute_event_status(
+        ends_at: datetime,
+        rejected_at: datetime | None,
+) -> EventStatusEnum:
+    if rejected_at is not None:
+        return EventStatusEnum.REJECTED
+
+    if ends_at.tzinfo is None:
+        ends_at = ends_at.replace(tzinfo=timezone.utc)
+
+    now = datetime.now(tz=timezone.utc)
+    if ends_at <= now:
+        return EventStatusEnum.PAST
+    return EventStatusEnum.ACTIVE
+
+
 class Event(Base):
     __tablename__ = "event"
+    __table_args__ = (
+        # events still waiting for the statistics roll-over
+        Index(
+            "ix_event_statistics_pending_past",
+            "ends_at",
+            postgresql_where=text("NOT statistics_past"),
+        ),
+        # keyset of event cards and of the admin list sorted by start
+        Index("ix_event_starts_at_id", "starts_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str]
@@ -31,9 +64,19 @@ class Event(Base):
     image_url: Mapped[str]
     payment_info: Mapped[str | None] = mapped_column(Text)
     max_participants_count: Mapped[int | None]
+    # maintained by `EventParticipantsService`, counts PARTICIPATING only
+    participants_count: Mapped[int] = mapped_column(
+        default=0,
+        server_default="0",
+    )
     location: Mapped[str | None]
     created_at: Mapped[CreatedAt]
     rejected_at: Mapped[datetime | None]
+    # set once counted as past in statistics rollups, see roll-over task
+    statistics_past: Mapped[bool] = mapped_column(
+        default=False,
+        server_default=false(),
+    )
 
     participants: Mapped[list["EventParticipant"]] = relationship(
         back_populates="event",
@@ -42,23 +85,23 @@ class Event(Base):
 
     @property
     def status(self) -> EventStatusEnum:
-        if self.rejected_at is not None:
-            return EventStatusEnum.REJECTED
-
-        ends_at = self.ends_at
-        if ends_at.tzinfo is None:
-            ends_at = ends_at.replace(tzinfo=timezone.utc)
-
-        now = datetime.now(tz=timezone.utc)
-        if ends_at <= now:
-            return EventStatusEnum.PAST
-        return EventStatusEnum.ACTIVE
+        return compute_event_status(self.ends_at, self.rejected_at)
 
 
 class EventParticipant(Base):
     __tablename__ = "event_participant"
     __table_args__ = (
         UniqueConstraint("event_id", "user_id", name="event_participant_unique"),
+        Index("ix_event_participant_event_id_status", "event_id", "status"),
+        Index("ix_event_participant_user_id", "user_id"),
+        # participants still waiting for the event reminder
+        Index(
+            "ix_event_participant_reminder_pending",
+            "event_id",
+            postgresql_where=text(
+                "status = 'PARTICIPATING' AND reminder_queued_at IS NULL"
+            ),
+        ),
     )
 
     class ParticipationStatusEnum(StrEnum):
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import ARRAY, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, CreatedAt
+
+
+class ExportJobStatusEnum(StrEnum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+
+
+class ExportJob(Base):
+    """ Participants export rendered by a worker and stored in S3 """
+
+    __tablename__ = "export_job"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    status: Mapped[ExportJobStatusEnum] = mapped_column(
+        default=ExportJobStatusEnum.PENDING,
+    )
+    format: Mapped[str]
+    # not a foreign key: the archive outlives deleted events
+    event_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer))
+    s3_key: Mapped[str | None]
+    error: Mapped[str | None]
+    created_at: Mapped[CreatedAt]
+    finished_at: Mapped[datetime | None]
+
+    requested_by_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="cascade"),
+    )
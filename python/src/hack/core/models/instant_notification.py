@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, CreatedAt
@@ -9,6 +9,21 @@ from .user import User
 
 class InstantNotification(Base):
     __tablename__ = "instant_notification"
+    __table_args__ = (
+        # inbox of a recipient, newest first
+        Index(
+            "ix_instant_notification_recipient_id_created_at",
+            "recipient_id",
+            "created_at",
+        ),
+        # unread inbox, the default listing skips the acked majority
+        Index(
+            "ix_instant_notification_unread",
+            "recipient_id",
+            "created_at",
+            postgresql_where=text("acked_at IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
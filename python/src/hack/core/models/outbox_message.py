@@ -0,0 +1,22 @@
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, CreatedAt
+
+
+class OutboxMessage(Base):
+    """ Task kick persisted in the same transaction as the business data """
+
+    __tablename__ = "outbox_message"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    task_name: Mapped[str]
+    kwargs: Mapped[dict[str, Any]] = mapped_column(JSONB)
+    # labels of the task, e.g. retry settings, sent along with the kick
+    labels: Mapped[dict[str, Any]] = mapped_column(
+        JSONB,
+        server_default="{}",
+    )
+    created_at: Mapped[CreatedAt]
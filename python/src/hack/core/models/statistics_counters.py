@@ -0,0 +1,44 @@
+from datetime import date
+
+from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class StatisticsDailyRollup(Base):
+    """
+    Event counters by the start date, see `StatisticsCountersService`.
+
+    `events`, `past_events` and `participations` count not rejected
+    events only, `rejected_events` counts the rest.
+    """
+
+    __tablename__ = "statistics_daily_rollup"
+
+    day: Mapped[date] = mapped_column(primary_key=True)
+    events: Mapped[int] = mapped_column(default=0)
+    past_events: Mapped[int] = mapped_column(default=0)
+    rejected_events: Mapped[int] = mapped_column(default=0)
+    participations: Mapped[int] = mapped_column(default=0)
+
+
+class StatisticsUserParticipations(Base):
+    """ Participations of a user in not rejected events """
+
+    __tablename__ = "statistics_user_participations"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="cascade"),
+        primary_key=True,
+    )
+    participations: Mapped[int] = mapped_column(default=0)
+
+
+class StatisticsCounter(Base):
+    """ Global counters that can not be summed from the daily rollups """
+
+    __tablename__ = "statistics_counter"
+
+    name: Mapped[str] = mapped_column(primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, default=0)
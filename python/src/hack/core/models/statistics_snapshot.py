@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class StatisticsSnapshot(Base):
+    """ Precomputed statistics payload, see `StatisticsService` """
+
+    __tablename__ = "statistics_snapshot"
+
+    name: Mapped[str] = mapped_column(primary_key=True)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB)
+    computed_at: Mapped[datetime]
@@ -1,10 +1,11 @@
 from collections.abc import AsyncGenerator, Iterable
-from typing import Literal
+from typing import Literal, NewType
 
+import aioboto3
 from dishka import Provider, Scope, provide
 from pydantic import BaseModel, EmailStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, create_engine, event
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -14,6 +15,8 @@ from sqlalchemy.orm import Session
 
 from redis.asyncio import Redis as AsyncRedis
 
+from hack.core.database_pool import MeteredAsyncQueuePool
+
 
 class ConfigPostgres(BaseModel):
     host: str
@@ -25,12 +28,30 @@ class ConfigPostgres(BaseModel):
     use_test_by_default: bool = False
     pool_size: int = 5
     pool_max_overflow: int = 10
+    pool_timeout: float = 30.0  # seconds to wait for a free connection
+    pool_recycle: int = 3600  # seconds, -1 keeps connections forever
+    pool_pre_ping: bool = False
+    # executions before psycopg prepares a statement on the server,
+    # `None` disables it, e.g. behind pgbouncer in transaction mode
+    prepare_threshold: int | None = 5
+    prepared_max_size: int = 100  # prepared statements per connection
+    query_cache_size: int = 500  # compiled statements per engine
+    # read-only endpoints go to the replica when set, same credentials
+    replica_host: str | None = None
+    replica_port: int | None = None
+    # seconds a login session reads from the primary after its write
+    read_your_writes_window: float = 5.0
+
+    @property
+    def has_replica(self) -> bool:
+        return bool(self.replica_host)
 
     def get_sqlalchemy_url(
         self,
         driver: str,
         *,
         is_test_database: bool | None = None,
+        replica: bool = False,
     ):
         if is_test_database is None:
             is_test_database = self.use_test_by_default
@@ -41,7 +62,13 @@ class ConfigPostgres(BaseModel):
                 raise ValueError("Test database not specified")
             database = self.test_database
 
-        return f"postgresql+{driver}://{self.user}:{self.password}@{self.host}:{self.port}/{database}"
+        host, port = self.host, self.port
+        if replica:
+            if not self.has_replica:
+                raise ValueError("Replica host not specified")
+            host, port = self.replica_host, self.replica_port or self.port
+
+        return f"postgresql+{driver}://{self.user}:{self.password}@{host}:{port}/{database}"
 
 
 class ConfigRedis(BaseModel):
@@ -75,6 +102,9 @@ class ConfigEmail(BaseModel):
     start_tls: bool = False
     use_tls: bool = False
     timeout: float = 5.0
+    pool_size: int = 4  # open smtp connections per worker
+    pool_idle_timeout: float = 30.0  # seconds
+    pool_max_messages: int = 100  # reconnect after that many messages
 
 
 class ConfigS3(BaseModel):
@@ -84,12 +114,40 @@ class ConfigS3(BaseModel):
     bucket: str
     region_name: str | None = None
     public_base_url: str | None = None
+    presigned_url_ttl: int = 3600  # seconds, for private objects
 
 
 class ConfigTemplates(BaseModel):
     recovery_url_template: str  # expects `{token}`
     event_card_url_template: str  # expects `{event_id}`
     event_url_template: str  # expects `{event_id}`
+    email_bundle_path: str | None = None  # see `compile-email-templates`
+    email_bytecode_cache_dir: str | None = None  # used without a bundle
+    email_auto_reload: bool = True  # disable in production
+
+
+class ConfigLoginSessionCache(BaseModel):
+    enabled: bool = True
+    local_max_size: int = 10_000
+    local_ttl: float = 5.0  # seconds, bounds staleness across processes
+    redis_ttl: int = 300  # seconds
+
+
+class ConfigPasswordHashing(BaseModel):
+    pool_size: int = 2
+    queue_depth: int = 64  # waiting jobs allowed on top of busy workers
+    retry_after: int = 1  # seconds, sent with 503 when saturated
+
+
+class ConfigStatisticsCache(BaseModel):
+    enabled: bool = True
+    global_ttl: float = 30.0  # seconds, events counts kept in process
+    user_ttl: int = 300  # seconds, per user summaries kept in redis
+
+
+class ConfigOutbox(BaseModel):
+    batch_size: int = 100
+    poll_interval: float = 0.5  # seconds, when the outbox is drained
 
 
 class ConfigHack(BaseSettings):
@@ -105,6 +163,11 @@ class ConfigHack(BaseSettings):
     email: ConfigEmail
     s3: ConfigS3
     templates: ConfigTemplates
+    login_session_cache: ConfigLoginSessionCache = ConfigLoginSessionCache()
+    password_hashing: ConfigPasswordHashing = ConfigPasswordHashing()
+    outbox: ConfigOutbox = ConfigOutbox()
+    statistics_cache: ConfigStatisticsCache = ConfigStatisticsCache()
+
 
 class ProviderConfig(Provider):
     @provide(scope=Scope.APP)
@@ -146,16 +209,96 @@ class ProviderConfig(Provider):
     ) -> ConfigTemplates:
         return config.templates
 
+    @provide(scope=Scope.APP)
+    def get_config_login_session_cache(
+            self,
+            config: ConfigHack,
+    ) -> ConfigLoginSessionCache:
+        return config.login_session_cache
+
+    @provide(scope=Scope.APP)
+    def get_config_password_hashing(
+            self,
+            config: ConfigHack,
+    ) -> ConfigPasswordHashing:
+        return config.password_hashing
+
+    @provide(scope=Scope.APP)
+    def get_config_outbox(
+            self,
+            config: ConfigHack,
+    ) -> ConfigOutbox:
+        return config.outbox
+
+    @provide(scope=Scope.APP)
+    def get_config_statistics_cache(
+            self,
+            config: ConfigHack,
+    ) -> ConfigStatisticsCache:
+        return config.statistics_cache
+
+
+ReplicaEngine = NewType("ReplicaEngine", AsyncEngine)
+ReadOnlySession = NewType("ReadOnlySession", AsyncSession)
+# read-your-writes: reads of a recent writer must not go to the replica
+ReadFromPrimary = NewType("ReadFromPrimary", bool)
+
+
+def _create_database_engine(config: ConfigPostgres, url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url,
+        poolclass=MeteredAsyncQueuePool,
+        pool_size=config.pool_size,
+        max_overflow=config.pool_max_overflow,
+        pool_timeout=config.pool_timeout,
+        pool_recycle=config.pool_recycle,
+        pool_pre_ping=config.pool_pre_ping,
+        query_cache_size=config.query_cache_size,
+        connect_args={"prepare_threshold": config.prepare_threshold},
+    )
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_prepared_max_size(dbapi_connection, _connection_record):
+        dbapi_connection.driver_connection.prepared_max_size = (
+            config.prepared_max_size
+        )
+
+    return engine
+
 
 class ProviderDatabase(Provider):
     @provide(scope=Scope.APP)
-    def get_database_engine(
+    async def get_database_engine(
             self,
             config: ConfigPostgres,
-    ) -> AsyncEngine:
-        return create_async_engine(
+    ) -> AsyncGenerator[AsyncEngine, None]:
+        engine = _create_database_engine(
+            config,
             config.get_sqlalchemy_url("psycopg"),
         )
+        try:
+            yield engine
+        finally:
+            await engine.dispose()
+
+    @provide(scope=Scope.APP)
+    async def get_replica_engine(
+            self,
+            config: ConfigPostgres,
+            engine: AsyncEngine,
+    ) -> AsyncGenerator[ReplicaEngine, None]:
+        if not config.has_replica:
+            yield ReplicaEngine(engine)
+            return
+
+        replica_engine = _create_database_engine(
+            config,
+            config.get_sqlalchemy_url("psycopg", replica=True),
+        )
+        try:
+            yield ReplicaEngine(replica_engine)
+        finally:
+            await replica_engine.dispose()
 
     @provide(scope=Scope.SESSION)
     async def get_database_session(
@@ -168,6 +311,30 @@ class ProviderDatabase(Provider):
         ) as session:
             yield session
 
+    @provide(scope=Scope.REQUEST)
+    def get_read_from_primary(self) -> ReadFromPrimary:
+        # no writers to track outside of the rest server
+        return ReadFromPrimary(False)
+
+    @provide(scope=Scope.REQUEST)
+    async def get_read_only_session(
+            self,
+            config: ConfigPostgres,
+            session: AsyncSession,
+            replica_engine: ReplicaEngine,
+            read_from_primary: ReadFromPrimary,
+    ) -> AsyncGenerator[ReadOnlySession, None]:
+        # reuse the request session instead of a second primary connection
+        if read_from_primary or not config.has_replica:
+            yield ReadOnlySession(session)
+            return
+
+        async with AsyncSession(
+            replica_engine,
+            expire_on_commit=False,
+        ) as replica_session:
+            yield ReadOnlySession(replica_session)
+
 
 class ProviderRedis(Provider):
     @provide(scope=Scope.APP)
@@ -189,6 +356,26 @@ class ProviderRedis(Provider):
                 await client.connection_pool.disconnect()
 
 
+S3Client = NewType("S3Client", object)
+
+
+class ProviderS3(Provider):
+    @provide(scope=Scope.APP)
+    async def get_s3_client(
+            self,
+            config: ConfigS3,
+    ) -> AsyncGenerator[S3Client, None]:
+        session = aioboto3.Session()
+        async with session.client(
+                "s3",
+                endpoint_url=config.endpoint_url,
+                aws_access_key_id=config.access_key,
+                aws_secret_access_key=config.secret_key,
+                region_name=config.region_name,
+        ) as client:
+            yield client
+
+
 class ProviderTestDatabase(Provider):
     def get_database_engine(
             self,
@@ -4,8 +4,6 @@ from datetime import datetime, timedelta, timezone
 from hmac import compare_digest
 from uuid import UUID
 
-from argon2 import PasswordHasher
-from argon2 import exceptions as argon2_exceptions
 from pydantic import EmailStr
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -27,6 +25,8 @@ from hack.core.models import (
     IssuedLoginRecovery,
 )
 from hack.core.models.user import UserRoleEnum
+from hack.core.services.login_session_cache import LoginSessionCache
+from hack.core.services.password_hashing import PasswordHashingExecutor
 
 
 class AccessService:
@@ -39,12 +39,14 @@ class AccessService:
     def __init__(
             self,
             orm_session: AsyncSession,
-            ph: PasswordHasher,
+            ph: PasswordHashingExecutor,
             redis_client: AsyncRedis,
+            login_session_cache: LoginSessionCache,
     ):
         self.orm_session = orm_session
         self.ph = ph
         self._redis = redis_client
+        self._login_session_cache = login_session_cache
 
     async def issue_registration(
             self,
@@ -62,7 +64,7 @@ class AccessService:
         if retry_after is not None:
             raise ErrorRegistrationRateLimited(retry_after=retry_after)
 
-        password_hash = self.ph.hash(password)
+        password_hash = await self.ph.hash(password)
         verification_code = secrets.randbelow(900000) + 100000
         token = uuid.uuid4()
         issued_registration = IssuedRegistration(
@@ -183,7 +185,7 @@ class AccessService:
         if user is None:
             raise ErrorRecoveryTokenInvalid
 
-        user.password_hash = self.ph.hash(password)
+        user.password_hash = await self.ph.hash(password)
         issued_recovery.used_at = now
         await self.orm_session.flush()
 
@@ -194,6 +196,17 @@ class AccessService:
             login_session_uid: UUID,
             login_session_token: str,
     ) -> LoginSession:
+        cached = await self._login_session_cache.get(login_session_uid)
+        if cached is not None:
+            if not self._login_session_cache.check_token(
+                    cached,
+                    login_session_token,
+            ):
+                raise ErrorUnauthorized
+            if cached.deleted_at is not None:
+                raise ErrorUnauthorized
+            return cached.to_login_session(login_session_token)
+
         login_session = await self.orm_session.get(
             LoginSession, login_session_uid)
 
@@ -206,6 +219,15 @@ class AccessService:
         ):
             raise ErrorUnauthorized
 
+        # the user is read again after the generation: an invalidation
+        # either happens after this read, or makes `put` skip the entry
+        generation = await self._login_session_cache.get_generation(
+            login_session.user_id,
+        )
+        if generation is not None:
+            await self.orm_session.refresh(login_session.user)
+            await self._login_session_cache.put(login_session, generation)
+
         if login_session.user.deleted_at is not None:
             raise ErrorUnauthorized
 
@@ -227,25 +249,23 @@ class AccessService:
         dummy_hash = ("$argon2id$v=19$m=65536,t=3,p=4$1/kKopFhFTmJP0aLfW"
                       "15XQ$fwP4HIJ1Dwtk7Fb5XzW8HDenJ7WroA6fiz0FAynO1cA")
         dummy_password = "dummy password horse battery"
-        self.ph.verify(dummy_hash, dummy_password)
+        await self.ph.verify(dummy_hash, dummy_password)
         await self._dummy_rehash()
 
     async def _dummy_rehash(self):
-        self.ph.hash("password horse battery dummy")
+        await self.ph.hash("password horse battery dummy")
 
     async def _authenticate_user(
             self,
             user: User,
             password: str,
     ) -> None:
-        try:
-            self.ph.verify(user.password_hash, password)
-        except argon2_exceptions.VerifyMismatchError as e:
+        if not await self.ph.verify(user.password_hash, password):
             await self._dummy_rehash()
-            raise ErrorUnauthorized from e
+            raise ErrorUnauthorized
 
         if self.ph.check_needs_rehash(user.password_hash):
-            user.password_hash = self.ph.hash(password)
+            user.password_hash = await self.ph.hash(password)
         else:
             await self._dummy_rehash()
 
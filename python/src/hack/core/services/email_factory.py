@@ -1,14 +1,28 @@
 from __future__ import annotations
 
+import time
+import zipfile
+from collections import OrderedDict
 from datetime import datetime, timezone
+from logging import getLogger
 from pathlib import Path
 from typing import Any, Iterable
 
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (
+    BaseLoader,
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    ModuleLoader,
+    select_autoescape,
+)
+from markupsafe import escape
 
 from hack.core.models.notification_events import (
     AdminSetPasswordNotification,
     EventCreatedNotification,
+    EventNotificationBase,
     EventParticipationCancelledNotification,
     EventParticipationConfirmedNotification,
     EventReminderNotification,
@@ -23,14 +37,76 @@ from hack.core.models.notification_events import (
 )
 from hack.core.providers import ConfigTemplates
 
+logger = getLogger(__name__)
+
 BRAND_NAME = "TTK Афиша"
 FOOTER_NOTE = (
     "Это письмо отправлено автоматически сервисом «Афиша TTK». "
     "Вы получили его, потому что участвуете в корпоративных мероприятиях."
 )
+# stands for the recipient name in emails rendered once for many recipients
+GREETING_PLACEHOLDER = "__HACK_RECIPIENT_NAME__"
+DEFAULT_GREETING_NAME = "коллега"
+# names of the compiled templates, modules in a bundle are named by hash
+BUNDLE_MANIFEST = "templates.txt"
+
+
+def personalize_email(
+        rendered_email: RenderedEmail,
+        recipient_name: str | None,
+) -> RenderedEmail:
+    """ Substitute the greeting of an email built with `build_shared` """
+
+    name = recipient_name or DEFAULT_GREETING_NAME
+    return rendered_email.model_copy(update={
+        "content": rendered_email.content.replace(GREETING_PLACEHOLDER, name),
+        "html_content": rendered_email.html_content.replace(
+            GREETING_PLACEHOLDER,
+            escape(name),
+        ),
+    })
+
+
+def default_template_dirs() -> list[Path]:
+    base = Path(__file__).resolve()
+    candidates: list[Path] = []
+    for depth in (4, 5):
+        try:
+            candidate = base.parents[depth] / "templates" / "email"
+        except IndexError:
+            continue
+        if candidate.exists():
+            candidates.append(candidate)
+    return candidates
+
+
+def compile_email_templates(
+        target: Path,
+        template_dirs: Iterable[Path] | None = None,
+) -> None:
+    """ Precompile email templates into a zip bundle for `ModuleLoader` """
+
+    paths = list(template_dirs or default_template_dirs())
+    if not paths:
+        raise FileNotFoundError("Email templates directory was not found")
+
+    env = Environment(
+        loader=FileSystemLoader(paths),
+        autoescape=select_autoescape(["html"]),
+    )
+    env.compile_templates(target, zip="deflated", ignore_errors=False)
+    with zipfile.ZipFile(target, "a") as bundle:
+        bundle.writestr(BUNDLE_MANIFEST, "\n".join(env.list_templates()))
+
+
+def _read_bundle_manifest(bundle_path: str) -> list[str]:
+    with zipfile.ZipFile(bundle_path) as bundle:
+        return bundle.read(BUNDLE_MANIFEST).decode().splitlines()
 
 
 class EmailFactory:
+    RENDER_CACHE_SIZE = 256
+
     def __init__(
             self,
             config_templates: ConfigTemplates,
@@ -38,17 +114,97 @@ class EmailFactory:
             brand_name: str = BRAND_NAME,
     ):
         self._config_templates = config_templates
-        paths = list(template_dirs or self._default_template_dirs())
-        if not paths:
-            raise FileNotFoundError("Email templates directory was not found")
+        loader: BaseLoader
+        bytecode_cache: BytecodeCache | None = None
+        if config_templates.email_bundle_path:
+            # the bundle is self-contained, sources are not shipped with it
+            loader = ModuleLoader(config_templates.email_bundle_path)
+            self._template_names = _read_bundle_manifest(
+                config_templates.email_bundle_path,
+            )
+        else:
+            paths = list(template_dirs or default_template_dirs())
+            if not paths:
+                raise FileNotFoundError(
+                    "Email templates directory was not found",
+                )
+            loader = FileSystemLoader(paths)
+            self._template_names = loader.list_templates()
+            if config_templates.email_bytecode_cache_dir:
+                bytecode_cache = FileSystemBytecodeCache(
+                    config_templates.email_bytecode_cache_dir,
+                )
 
         self._env = Environment(
-            loader=FileSystemLoader(paths),
+            loader=loader,
             autoescape=select_autoescape(["html"]),
+            auto_reload=config_templates.email_auto_reload,
+            bytecode_cache=bytecode_cache,
         )
         self._brand_name = brand_name
+        self._render_cache: OrderedDict[str, RenderedEmail] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def build(self, event: NotificationEvent) -> RenderedEmail:
+        if not isinstance(event, EventNotificationBase):
+            # account emails carry codes and passwords, never keep them
+            return self._build(event)
+        return self._build_cached(event.model_dump_json(), event)
+
+    def build_shared(self, event: EventNotificationBase) -> RenderedEmail:
+        """
+        Render an event email once for all its recipients.
+
+        The greeting is left as `GREETING_PLACEHOLDER`, fill it per
+        recipient with `personalize_email`.
+        """
+
+        key = event.model_dump_json(exclude={"recipient_name"})
+        shared_event = event.model_copy(
+            update={"recipient_name": GREETING_PLACEHOLDER},
+        )
+        return self._build_cached(f"shared:{key}", shared_event)
+
+    def warm_up(self) -> None:
+        """ Load every template so the first emails skip compilation """
+
+        started_at = time.perf_counter()
+        names = self._template_names
+        for name in names:
+            self._env.get_template(name)
+        logger.info(
+            "Email templates warmed up; count=%s elapsed=%.1fms",
+            len(names),
+            (time.perf_counter() - started_at) * 1000,
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "size": len(self._render_cache),
+        }
+
+    def _build_cached(
+            self,
+            key: str,
+            event: EventNotificationBase,
+    ) -> RenderedEmail:
+        rendered_email = self._render_cache.get(key)
+        if rendered_email is not None:
+            self.cache_hits += 1
+            self._render_cache.move_to_end(key)
+            return rendered_email
+
+        self.cache_misses += 1
+        rendered_email = self._build(event)
+        self._render_cache[key] = rendered_email
+        while len(self._render_cache) > self.RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        return rendered_email
+
+    def _build(self, event: NotificationEvent) -> RenderedEmail:
         match event.type:
             case NotificationEventTypeEnum.REG_CONFIRM_CODE:
                 return self._render_registration_confirm(event)
@@ -354,21 +510,11 @@ class EmailFactory:
     ) -> str:
         date_text, time_text = self._format_datetime(event.starts_at)
         location = event.location or "Формат уточняется"
+        if event.recipient_name:
+            lead = f"Здравствуйте, {event.recipient_name}!\n\n{lead}"
         return (
             f"{lead}\n\n"
             f"Событие: {event.event_name}\n"
             f"Когда: {date_text} в {time_text} (UTC)\n"
             f"Где: {location}"
         )
-
-    def _default_template_dirs(self) -> list[Path]:
-        base = Path(__file__).resolve()
-        candidates: list[Path] = []
-        for depth in (4, 5):
-            try:
-                candidate = base.parents[depth] / "templates" / "email"
-            except IndexError:
-                continue
-            if candidate.exists():
-                candidates.append(candidate)
-        return candidates
@@ -0,0 +1,106 @@
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from hack.core.models import Event, EventParticipant
+
+
+class EventParticipantsService:
+    """
+    Maintains the denormalized `Event.participants_count`.
+
+    Counters are changed with single `UPDATE ... RETURNING` statements,
+    so concurrent transactions never lose an increment.  The returned
+    value is put to the loaded event without marking it dirty, so the
+    ORM flush never writes a stale counter back.  Drifted counters are
+    recounted one locked event at a time, a join committed meanwhile
+    would be missed by a single statement snapshot.
+    """
+
+    def __init__(
+            self,
+            session: AsyncSession,
+    ):
+        self._session = session
+
+    async def reserve_seat(self, event: Event) -> bool:
+        """ Count one more participant unless the event is full """
+
+        stmt = (
+            update(Event)
+            .where(Event.id == event.id)
+            .where(or_(
+                Event.max_participants_count.is_(None),
+                Event.participants_count < Event.max_participants_count,
+            ))
+            .values(participants_count=Event.participants_count + 1)
+            .returning(Event.participants_count)
+            .execution_options(synchronize_session=False)
+        )
+        participants_count = await self._session.scalar(stmt)
+        if participants_count is None:
+            return False
+        set_committed_value(event, "participants_count", participants_count)
+        return True
+
+    async def release_seat(self, event: Event) -> None:
+        stmt = (
+            update(Event)
+            .where(Event.id == event.id)
+            .values(participants_count=Event.participants_count - 1)
+            .returning(Event.participants_count)
+            .execution_options(synchronize_session=False)
+        )
+        participants_count = await self._session.scalar(stmt)
+        set_committed_value(event, "participants_count", participants_count)
+
+    async def recount(self, event: Event) -> int:
+        """ Recalculate the counter after participants were replaced """
+
+        stmt = (
+            update(Event)
+            .where(Event.id == event.id)
+            .values(participants_count=self._actual_count())
+            .returning(Event.participants_count)
+            .execution_options(synchronize_session=False)
+        )
+        participants_count = await self._session.scalar(stmt)
+        set_committed_value(event, "participants_count", participants_count)
+        return participants_count
+
+    async def reconcile(self) -> list[int]:
+        """ Fix drifted counters, returns ids of the fixed events """
+
+        stmt = (
+            select(Event.id)
+            .where(Event.participants_count != self._actual_count())
+            .order_by(Event.id)
+        )
+        fixed_ids = []
+        for event_id in list(await self._session.scalars(stmt)):
+            # joins change the counter under the row lock, so once it is
+            # taken the recount sees every participant of the counter
+            event = await self._session.scalar(
+                select(Event)
+                .where(Event.id == event_id)
+                .with_for_update()
+                .execution_options(populate_existing=True),
+            )
+            if event is None:
+                continue
+            participants_count = event.participants_count
+            if await self.recount(event) != participants_count:
+                fixed_ids.append(event_id)
+        return fixed_ids
+
+    @staticmethod
+    def _actual_count():
+        return (
+            select(func.count(EventParticipant.id))
+            .where(EventParticipant.event_id == Event.id)
+            .where(
+                EventParticipant.status
+                == EventParticipant.ParticipationStatusEnum.PARTICIPATING
+            )
+            .scalar_subquery()
+        )
@@ -0,0 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hack.core.models import ExportJob
+from hack.core.services.outbox import OutboxService
+from hack.tasks.tasks.export_jobs import run_export_job
+
+
+class ExportJobService:
+    """ Creates participants export jobs, see `run_export_job` """
+
+    def __init__(
+            self,
+            session: AsyncSession,
+            outbox: OutboxService,
+    ):
+        self._session = session
+        self._outbox = outbox
+
+    async def create(
+            self,
+            requested_by_id: int,
+            event_ids: list[int],
+            fmt: str,
+    ) -> ExportJob:
+        job = ExportJob(
+            requested_by_id=requested_by_id,
+            event_ids=event_ids,
+            format=fmt,
+        )
+        self._session.add(job)
+        await self._session.flush()
+        await self._outbox.enqueue(run_export_job, [{"job_id": job.id}])
+        return job
@@ -0,0 +1,225 @@
+import hashlib
+import secrets
+import time
+from collections import OrderedDict
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import WatchError
+
+from hack.core.models import LoginSession, User
+from hack.core.models.user import UserRoleEnum
+from hack.core.providers import ConfigLoginSessionCache
+
+
+class CachedLoginSession(BaseModel):
+    """ Minimal projection of a login session required to authorize """
+
+    uid: UUID
+    token_digest: str
+    user_id: int
+    role: UserRoleEnum
+    is_system: bool
+    deleted_at: datetime | None
+    full_name: str
+    email: str
+
+    def to_login_session(self, token: str) -> LoginSession:
+        # detached instances: they are never added to the orm session
+        user = User(
+            id=self.user_id,
+            role=self.role,
+            is_system=self.is_system,
+            deleted_at=self.deleted_at,
+            full_name=self.full_name,
+            email=self.email,
+            username=self.email,
+        )
+        return LoginSession(
+            uid=self.uid,
+            token=token,
+            user_id=self.user_id,
+            user=user,
+        )
+
+
+class LoginSessionCache:
+    """
+    Two-tier cache of resolved login sessions.
+
+    In-process LRU is consulted first, then Redis.  Local entries live
+    for a few seconds only, so invalidation made by another process is
+    observed after at most `local_ttl`.
+
+    Every invalidation bumps a generation of the user.  Writers read it
+    before loading the session and `put` skips the entry when it has
+    changed, so a lookup racing with an invalidation can not restore the
+    stale session.
+    """
+
+    def __init__(
+            self,
+            config: ConfigLoginSessionCache,
+            redis_client: AsyncRedis,
+    ):
+        self._config = config
+        self._redis = redis_client
+        self._local: OrderedDict[UUID, tuple[float, CachedLoginSession]] = (
+            OrderedDict()
+        )
+        self.hits_local = 0
+        self.hits_redis = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.skipped_puts = 0
+
+    @staticmethod
+    def digest_token(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    @classmethod
+    def check_token(cls, entry: CachedLoginSession, token: str) -> bool:
+        return secrets.compare_digest(
+            entry.token_digest,
+            cls.digest_token(token),
+        )
+
+    async def get(self, uid: UUID) -> CachedLoginSession | None:
+        if not self._config.enabled:
+            return None
+
+        entry = self._get_local(uid)
+        if entry is not None:
+            self.hits_local += 1
+            return entry
+
+        raw = await self._redis.get(self._session_key(uid))
+        if raw is None:
+            self.misses += 1
+            return None
+
+        entry = CachedLoginSession.model_validate_json(raw)
+        self._put_local(entry)
+        self.hits_redis += 1
+        return entry
+
+    async def get_generation(self, user_id: int) -> int | None:
+        """ Generation to pass to `put`, None when the cache is disabled """
+
+        if not self._config.enabled:
+            return None
+        raw = await self._redis.get(self._generation_key(user_id))
+        return int(raw or 0)
+
+    async def put(
+            self,
+            login_session: LoginSession,
+            generation: int,
+    ) -> None:
+        """ Cache the session unless the user was invalidated since """
+
+        if not self._config.enabled:
+            return
+
+        user = login_session.user
+        entry = CachedLoginSession(
+            uid=login_session.uid,
+            token_digest=self.digest_token(login_session.token),
+            user_id=user.id,
+            role=user.role,
+            is_system=user.is_system,
+            deleted_at=user.deleted_at,
+            full_name=user.full_name,
+            email=user.email,
+        )
+        user_key = self._user_key(user.id)
+        generation_key = self._generation_key(user.id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            # an invalidation between the check and the write aborts it
+            await pipe.watch(generation_key)
+            if int(await pipe.get(generation_key) or 0) != generation:
+                self.skipped_puts += 1
+                return
+            pipe.multi()
+            pipe.set(
+                self._session_key(entry.uid),
+                entry.model_dump_json(),
+                ex=self._config.redis_ttl,
+            )
+            pipe.sadd(user_key, str(entry.uid))
+            pipe.expire(user_key, self._config.redis_ttl)
+            try:
+                await pipe.execute()
+            except WatchError:
+                self.skipped_puts += 1
+                return
+        self._put_local(entry)
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """ Drop every cached session of the user """
+
+        self.invalidations += 1
+        for uid, (_, entry) in list(self._local.items()):
+            if entry.user_id == user_id:
+                del self._local[uid]
+
+        # bumped first: puts in flight are skipped from now on.  It only
+        # has to outlive the sessions cached before it
+        generation_key = self._generation_key(user_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.incr(generation_key)
+            pipe.expire(generation_key, self._config.redis_ttl)
+            await pipe.execute()
+
+        user_key = self._user_key(user_id)
+        uids = await self._redis.smembers(user_key)
+        keys = [self._session_key(self._decode(uid)) for uid in uids]
+        await self._redis.delete(user_key, *keys)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits_local": self.hits_local,
+            "hits_redis": self.hits_redis,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "skipped_puts": self.skipped_puts,
+            "local_size": len(self._local),
+        }
+
+    def _get_local(self, uid: UUID) -> CachedLoginSession | None:
+        item = self._local.get(uid)
+        if item is None:
+            return None
+        expires_at, entry = item
+        if expires_at <= time.monotonic():
+            del self._local[uid]
+            return None
+        self._local.move_to_end(uid)
+        return entry
+
+    def _put_local(self, entry: CachedLoginSession) -> None:
+        expires_at = time.monotonic() + self._config.local_ttl
+        self._local[entry.uid] = (expires_at, entry)
+        self._local.move_to_end(entry.uid)
+        while len(self._local) > self._config.local_max_size:
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def _session_key(uid: UUID | str) -> str:
+        return f"login_session:{uid}"
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"login_session:user:{user_id}"
+
+    @staticmethod
+    def _generation_key(user_id: int) -> str:
+        return f"login_session:user:{user_id}:generation"
+
+    @staticmethod
+    def _decode(value: bytes | str) -> str:
+        if isinstance(value, bytes):
+            return value.decode()
+        return value
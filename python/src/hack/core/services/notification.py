@@ -1,7 +1,6 @@
 from pydantic import EmailStr
-from sqlalchemy import select, or_
+from sqlalchemy import insert, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from taskiq import AsyncBroker
 
 from hack.core.models import (
     NotificationEvent,
@@ -9,19 +8,25 @@ from hack.core.models import (
 )
 from hack.core.models.instant_notification import InstantNotification
 from hack.core.models.notification_events import EventNotificationBase
-from hack.core.services.email_factory import EmailFactory
-from hack.tasks.tasks.send_email import send_email
+from hack.core.services.email_factory import (
+    EmailFactory,
+    personalize_email,
+)
+from hack.core.services.outbox import OutboxService
+from hack.tasks.tasks.send_email import send_email, send_email_batch
 
 
 class NotificationService:
+    EMAIL_BATCH_SIZE = 100
+
     def __init__(
             self,
             session: AsyncSession,
-            broker: AsyncBroker,
+            outbox: OutboxService,
             email_factory: EmailFactory,
     ):
         self._session = session
-        self._broker = broker
+        self._outbox = outbox
         self._email_factory = email_factory
 
     async def notify_about_event(
@@ -29,13 +34,27 @@ class NotificationService:
             event: NotificationEvent,
             recipients_emails: list[EmailStr] | None = None,
             recipients_ids: list[int] | None = None,
+            personalized: bool = False,
     ) -> None:
+        """
+        Notify recipients about the event.
+
+        With `personalized`, an event email is rendered once and every
+        recipient is greeted by name; `event.recipient_name` is ignored.
+        """
+
         recipients_emails = recipients_emails or []
         recipients_ids = recipients_ids or []
         if not recipients_emails and not recipients_ids:
             raise ValueError("Notification recipients must be provided")
 
-        rendered_email = self._email_factory.build(event)
+        personalized = (
+            personalized and isinstance(event, EventNotificationBase)
+        )
+        if personalized:
+            rendered_email = self._email_factory.build_shared(event)
+        else:
+            rendered_email = self._email_factory.build(event)
 
         filters = []
         if recipients_emails:
@@ -43,41 +62,80 @@ class NotificationService:
         if recipients_ids:
             filters.append(User.id.in_(recipients_ids))
 
-        recipients: list[User] = []
+        recipients = []
         if filters:
-            stmt = select(User).where(or_(*filters))
-            recipients = list(await self._session.scalars(stmt))
+            stmt = (
+                select(User.id, User.email, User.full_name)
+                .where(or_(*filters))
+            )
+            recipients = list(await self._session.execute(stmt))
 
+        known_emails = {user.email for user in recipients}
         extra_emails = [
             email for email in recipients_emails
-            if email not in {user.email for user in recipients}
+            if email not in known_emails
         ]
 
-        if isinstance(event, EventNotificationBase):
-            for user in recipients:
-                instant_notification = InstantNotification(
-                    title=rendered_email.subject,
-                    content=rendered_email.content,
-                    recipient_id=user.id,
-                    cta_url=rendered_email.context.get("cta_url"),
-                    cta_label=rendered_email.context.get("cta_label"),
-                )
-                self._session.add(instant_notification)
-
-        await self._session.flush()
+        if isinstance(event, EventNotificationBase) and recipients:
+            # bulk insert: one executemany, no identity map bookkeeping
+            await self._session.execute(
+                insert(InstantNotification),
+                [
+                    {
+                        "title": rendered_email.subject,
+                        "content": (
+                            personalize_email(
+                                rendered_email,
+                                user.full_name,
+                            ).content
+                            if personalized
+                            else rendered_email.content
+                        ),
+                        "recipient_id": user.id,
+                        "cta_url": rendered_email.context.get("cta_url"),
+                        "cta_label": rendered_email.context.get("cta_label"),
+                    }
+                    for user in recipients
+                ],
+            )
 
         all_emails = [
             *(i.email for i in recipients),
             *extra_emails,
         ]
-        for i in all_emails:
-            await (
-                send_email.kicker()
-                .with_broker(self._broker)
-                .kiq(
-                    to_email=i,
-                    subject=rendered_email.subject,
-                    content=rendered_email.content,
-                    html_content=rendered_email.html_content,
+        recipient_names = None
+        if personalized:
+            recipient_names = [
+                *(i.full_name for i in recipients),
+                *(None for _ in extra_emails),
+            ]
+
+        if len(all_emails) == 1:
+            if personalized:
+                rendered_email = personalize_email(
+                    rendered_email,
+                    recipient_names[0],
                 )
-            )
+            await self._outbox.enqueue(send_email, [{
+                "to_email": all_emails[0],
+                "subject": rendered_email.subject,
+                "content": rendered_email.content,
+                "html_content": rendered_email.html_content,
+            }])
+            return
+
+        # one message per chunk carries the rendered body once
+        chunks = []
+        for i in range(0, len(all_emails), self.EMAIL_BATCH_SIZE):
+            chunk = {
+                "recipients": all_emails[i:i + self.EMAIL_BATCH_SIZE],
+                "subject": rendered_email.subject,
+                "content": rendered_email.content,
+                "html_content": rendered_email.html_content,
+            }
+            if recipient_names is not None:
+                chunk["recipient_names"] = (
+                    recipient_names[i:i + self.EMAIL_BATCH_SIZE]
+                )
+            chunks.append(chunk)
+        await self._outbox.enqueue(send_email_batch, chunks)
@@ -0,0 +1,81 @@
+import time
+from typing import Any
+
+from redis.asyncio import Redis as AsyncRedis
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from taskiq import AsyncTaskiqDecoratedTask
+
+from hack.core.models import OutboxMessage
+
+
+class OutboxService:
+    """
+    Schedules task kicks through the transactional outbox.
+
+    Messages become visible to the relay only when the caller commits,
+    so they are never sent for rolled back changes and never lost
+    between commit and broker write.
+    """
+
+    def __init__(
+            self,
+            session: AsyncSession,
+    ):
+        self._session = session
+
+    async def enqueue(
+            self,
+            task: AsyncTaskiqDecoratedTask,
+            kwargs_list: list[dict[str, Any]],
+    ) -> None:
+        if not kwargs_list:
+            return
+
+        await self._session.execute(
+            insert(OutboxMessage),
+            [
+                {
+                    "task_name": task.task_name,
+                    "kwargs": kwargs,
+                    "labels": task.labels,
+                }
+                for kwargs in kwargs_list
+            ],
+        )
+
+
+class OutboxRelayMetrics:
+    """
+    Counters of the outbox relay, shared through Redis.
+
+    Relays run in their own processes, they record every batch here and
+    the REST server reads the totals back.
+    """
+
+    KEY = "outbox_relay:metrics"
+    FIELDS = ("batches", "relayed", "lag_seconds", "relayed_at")
+
+    def __init__(
+            self,
+            redis_client: AsyncRedis,
+    ):
+        self._redis = redis_client
+
+    async def record_batch(self, relayed: int, lag_seconds: float) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hincrby(self.KEY, "batches", 1)
+            pipe.hincrby(self.KEY, "relayed", relayed)
+            # lag of the oldest message of the last batch
+            pipe.hset(self.KEY, mapping={
+                "lag_seconds": lag_seconds,
+                "relayed_at": time.time(),
+            })
+            await pipe.execute()
+
+    async def stats(self) -> dict[str, float]:
+        values = await self._redis.hmget(self.KEY, self.FIELDS)
+        return {
+            field: float(value or 0)
+            for field, value in zip(self.FIELDS, values, strict=True)
+        }
@@ -0,0 +1,226 @@
+import asyncio
+import csv
+import io
+import shutil
+import zipfile
+from collections.abc import AsyncIterator
+from tempfile import SpooledTemporaryFile
+from typing import IO
+
+from openpyxl import Workbook
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hack.core.models import Event, EventParticipant, ExportJob, User
+from hack.core.providers import ConfigS3, ReadOnlySession, S3Client
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "xlsx": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    ),
+    "zip": "application/zip",
+}
+EXPORT_HEADERS = [
+    "user_id",
+    "email",
+    "full_name",
+    "status",
+    "joined_at",
+    "event_id",
+    "event_name",
+]
+
+
+class ParticipantsExportService:
+    """
+    Renders participants of an event as CSV or XLSX.
+
+    Rows are read through a server side cursor in batches of
+    `BATCH_SIZE`, so memory stays flat for any event size.  Export jobs
+    are rendered the same way and uploaded to S3.  Exports only read,
+    so rows are served by the replica; events of a job are looked up on
+    the primary, a lagging replica must not make them look deleted.
+    """
+
+    BATCH_SIZE = 1000
+    # files are assembled in a temporary file, kept in memory up to this size
+    SPOOL_SIZE = 8 * 1024 * 1024
+
+    def __init__(
+            self,
+            session: AsyncSession,
+            read_only_session: ReadOnlySession,
+            s3_client: S3Client,
+            s3_config: ConfigS3,
+    ):
+        self._session = session
+        self._read_only_session = read_only_session
+        self._s3 = s3_client
+        self._s3_config = s3_config
+
+    @staticmethod
+    def get_filename(event: Event, fmt: str) -> str:
+        return f"event_{event.id}_participants.{fmt}"
+
+    @staticmethod
+    def get_job_filename(job: ExportJob) -> str:
+        if len(job.event_ids) == 1:
+            return f"event_{job.event_ids[0]}_participants.{job.format}"
+        return f"participants_export_{job.id}.zip"
+
+    async def iter_rows(self, event: Event) -> AsyncIterator[list[str]]:
+        stmt = (
+            select(
+                EventParticipant.user_id,
+                User.email,
+                User.full_name,
+                EventParticipant.status,
+                EventParticipant.created_at.label("joined_at"),
+            )
+            .join(User, User.id == EventParticipant.user_id)
+            .where(EventParticipant.event_id == event.id)
+            .where(
+                EventParticipant.status
+                == EventParticipant.ParticipationStatusEnum.PARTICIPATING
+            )
+            .order_by(EventParticipant.created_at, EventParticipant.id)
+            .execution_options(yield_per=self.BATCH_SIZE)
+        )
+        result = await self._read_only_session.stream(stmt)
+        async for row in result:
+            yield [
+                str(row.user_id),
+                row.email,
+                row.full_name,
+                row.status.value,
+                row.joined_at.isoformat() if row.joined_at else "",
+                str(event.id),
+                event.name,
+            ]
+
+    async def iter_csv(self, event: Event) -> AsyncIterator[bytes]:
+        """ Yield the CSV file in chunks of about `BATCH_SIZE` rows """
+
+        buffer = io.StringIO(newline="")
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_HEADERS)
+        pending = 0
+        async for row in self.iter_rows(event):
+            writer.writerow(row)
+            pending += 1
+            if pending >= self.BATCH_SIZE:
+                yield self._drain(buffer)
+                pending = 0
+        yield self._drain(buffer)
+
+    async def write_xlsx(self, event: Event) -> IO[bytes]:
+        """ Render XLSX into a spooled file, rewound for reading """
+
+        # handed over to the caller, closed here only when rendering fails
+        fileobj = SpooledTemporaryFile(max_size=self.SPOOL_SIZE)  # noqa: SIM115
+        try:
+            await self._write_xlsx(event, fileobj)
+        except BaseException:
+            fileobj.close()
+            raise
+        fileobj.seek(0)
+        return fileobj
+
+    async def run_job(self, job: ExportJob) -> str:
+        """
+        Render the job and upload it to S3, returns the object key.
+
+        A single event is stored as is, many events are packed into a
+        zip archive with one file per event.
+
+        :raise LookupError: events were deleted since the job was created
+        """
+
+        events = list(await self._session.scalars(
+            select(Event)
+            .where(Event.id.in_(job.event_ids))
+            .order_by(Event.id)
+        ))
+        if len(events) != len(job.event_ids):
+            missing = set(job.event_ids) - {event.id for event in events}
+            raise LookupError(
+                f"Events not found: {', '.join(map(str, sorted(missing)))}"
+            )
+        filename = self.get_job_filename(job)
+        key = f"exports/{job.id}/{filename}"
+
+        with SpooledTemporaryFile(max_size=self.SPOOL_SIZE) as fileobj:
+            if len(events) == 1:
+                await self._write(events[0], job.format, fileobj)
+                media_type = EXPORT_MEDIA_TYPES[job.format]
+            else:
+                await self._write_zip(events, job.format, fileobj)
+                media_type = EXPORT_MEDIA_TYPES["zip"]
+            fileobj.seek(0)
+            # switches to a multipart upload for big files by itself
+            await self._s3.upload_fileobj(
+                fileobj,
+                self._s3_config.bucket,
+                key,
+                ExtraArgs={"ContentType": media_type},
+            )
+        return key
+
+    async def get_download_url(self, job: ExportJob) -> str:
+        return await self._s3.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": self._s3_config.bucket,
+                "Key": job.s3_key,
+                "ResponseContentDisposition": (
+                    f'attachment; filename="{self.get_job_filename(job)}"'
+                ),
+            },
+            ExpiresIn=self._s3_config.presigned_url_ttl,
+        )
+
+    async def _write(self, event: Event, fmt: str, fileobj: IO[bytes]) -> None:
+        if fmt == "csv":
+            async for chunk in self.iter_csv(event):
+                fileobj.write(chunk)
+        else:
+            await self._write_xlsx(event, fileobj)
+
+    async def _write_zip(
+            self,
+            events: list[Event],
+            fmt: str,
+            fileobj: IO[bytes],
+    ) -> None:
+        with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as archive:
+            for event in events:
+                name = self.get_filename(event, fmt)
+                with archive.open(name, "w", force_zip64=True) as entry:
+                    if fmt == "csv":
+                        async for chunk in self.iter_csv(event):
+                            entry.write(chunk)
+                    else:
+                        with SpooledTemporaryFile(
+                                max_size=self.SPOOL_SIZE,
+                        ) as sheet:
+                            await self._write_xlsx(event, sheet)
+                            sheet.seek(0)
+                            shutil.copyfileobj(sheet, entry)
+
+    async def _write_xlsx(self, event: Event, fileobj: IO[bytes]) -> None:
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(title="Participants")
+        ws.append(EXPORT_HEADERS)
+        async for row in self.iter_rows(event):
+            ws.append(row)
+
+        # zipping the sheet is blocking, keep it out of the event loop
+        await asyncio.to_thread(wb.save, fileobj)
+
+    @staticmethod
+    def _drain(buffer: io.StringIO) -> bytes:
+        content = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+        return content
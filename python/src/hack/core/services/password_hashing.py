@@ -0,0 +1,107 @@
+import asyncio
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from argon2 import PasswordHasher
+from argon2 import exceptions as argon2_exceptions
+
+from hack.core.errors.access import ErrorPasswordHashingOverloaded
+from hack.core.providers import ConfigPasswordHashing
+
+# per worker process hasher, created lazily by the pool workers
+_worker_hasher: PasswordHasher | None = None
+
+
+def _get_worker_hasher() -> PasswordHasher:
+    global _worker_hasher
+    if _worker_hasher is None:
+        _worker_hasher = PasswordHasher()
+    return _worker_hasher
+
+
+def _hash(password: str) -> tuple[str, float]:
+    started_at = time.time()
+    return _get_worker_hasher().hash(password), started_at
+
+
+def _verify(password_hash: str, password: str) -> tuple[bool, float]:
+    started_at = time.time()
+    try:
+        return _get_worker_hasher().verify(password_hash, password), started_at
+    except argon2_exceptions.VerifyMismatchError:
+        return False, started_at
+
+
+class PasswordHashingExecutor:
+    """
+    Runs argon2 hashing and verification in a bounded process pool.
+
+    Jobs above `pool_size + queue_depth` are rejected right away with
+    `ErrorPasswordHashingOverloaded` instead of piling up in the pool.
+    """
+
+    def __init__(self, config: ConfigPasswordHashing):
+        self._config = config
+        self._capacity = config.pool_size + config.queue_depth
+        self._pool = ProcessPoolExecutor(
+            max_workers=config.pool_size,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        # parameters check is a cheap string parsing, keep it in-process
+        self._hasher = PasswordHasher()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_hash, password)
+
+    async def verify(self, password_hash: str, password: str) -> bool:
+        return await self._submit(_verify, password_hash, password)
+
+    def check_needs_rehash(self, password_hash: str) -> bool:
+        return self._hasher.check_needs_rehash(password_hash)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds_avg": (
+                self.wait_seconds_total / self.completed
+                if self.completed
+                else 0.0
+            ),
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+    async def _submit(self, fn: Callable[..., tuple[Any, float]], *args):
+        if self._pending >= self._capacity:
+            self.rejected += 1
+            raise ErrorPasswordHashingOverloaded(
+                retry_after=self._config.retry_after,
+            )
+
+        self._pending += 1
+        submitted_at = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            result, started_at = await loop.run_in_executor(
+                self._pool, fn, *args,
+            )
+        finally:
+            self._pending -= 1
+
+        wait_seconds = max(0.0, started_at - submitted_at)
+        self.completed += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        return result
@@ -1,13 +1,31 @@
-from argon2 import PasswordHasher
+from collections.abc import Iterable
+
 from dishka import Provider, Scope, provide
+from redis.asyncio import Redis as AsyncRedis
 from sqlalchemy.ext.asyncio import AsyncSession
-from taskiq import AsyncBroker
 
 from hack.core.services.access import AccessService
 from hack.core.services.email_factory import EmailFactory
+from hack.core.services.event_participants import EventParticipantsService
+from hack.core.services.export_jobs import ExportJobService
+from hack.core.services.login_session_cache import LoginSessionCache
 from hack.core.services.notification import NotificationService
+from hack.core.services.outbox import OutboxRelayMetrics, OutboxService
+from hack.core.services.participants_export import ParticipantsExportService
+from hack.core.services.password_hashing import PasswordHashingExecutor
+from hack.core.services.statistics import StatisticsService
+from hack.core.services.statistics_cache import StatisticsCache
+from hack.core.services.query_plans import QueryPlansService
+from hack.core.services.read_your_writes import ReadYourWrites
+from hack.core.services.statistics_counters import StatisticsCountersService
 from hack.core.services.uow_ctl import UoWCtl
-from hack.core.providers import ConfigTemplates
+from hack.core.providers import (
+    ConfigLoginSessionCache,
+    ConfigPasswordHashing,
+    ConfigPostgres,
+    ConfigStatisticsCache,
+    ConfigTemplates,
+)
 
 
 class ProviderServices(Provider):
@@ -24,8 +42,48 @@ class ProviderServices(Provider):
         return orm_session
 
     @provide(scope=Scope.APP)
-    def get_password_hasher(self) -> PasswordHasher:
-        return PasswordHasher()
+    def get_password_hashing_executor(
+            self,
+            config: ConfigPasswordHashing,
+    ) -> Iterable[PasswordHashingExecutor]:
+        executor = PasswordHashingExecutor(config=config)
+        try:
+            yield executor
+        finally:
+            executor.shutdown()
+
+    @provide(scope=Scope.APP)
+    def get_login_session_cache(
+            self,
+            config: ConfigLoginSessionCache,
+            redis_client: AsyncRedis,
+    ) -> LoginSessionCache:
+        return LoginSessionCache(
+            config=config,
+            redis_client=redis_client,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_statistics_cache(
+            self,
+            config: ConfigStatisticsCache,
+            redis_client: AsyncRedis,
+    ) -> StatisticsCache:
+        return StatisticsCache(
+            config=config,
+            redis_client=redis_client,
+        )
+
+    @provide(scope=Scope.APP)
+    def get_read_your_writes(
+            self,
+            config: ConfigPostgres,
+            redis_client: AsyncRedis,
+    ) -> ReadYourWrites:
+        return ReadYourWrites(
+            config=config,
+            redis_client=redis_client,
+        )
 
     @provide(scope=Scope.APP)
     def get_email_factory(
@@ -34,15 +92,55 @@ class ProviderServices(Provider):
     ) -> EmailFactory:
         return EmailFactory(config_templates=config_templates)
 
+    get_outbox_service = provide(
+        OutboxService,
+        scope=Scope.REQUEST,
+    )
+
+    get_outbox_relay_metrics = provide(
+        OutboxRelayMetrics,
+        scope=Scope.APP,
+    )
+
+    get_event_participants_service = provide(
+        EventParticipantsService,
+        scope=Scope.REQUEST,
+    )
+
+    get_participants_export_service = provide(
+        ParticipantsExportService,
+        scope=Scope.REQUEST,
+    )
+
+    get_export_job_service = provide(
+        ExportJobService,
+        scope=Scope.REQUEST,
+    )
+
+    get_statistics_service = provide(
+        StatisticsService,
+        scope=Scope.REQUEST,
+    )
+
+    get_statistics_counters_service = provide(
+        StatisticsCountersService,
+        scope=Scope.REQUEST,
+    )
+
+    get_query_plans_service = provide(
+        QueryPlansService,
+        scope=Scope.REQUEST,
+    )
+
     @provide(scope=Scope.REQUEST)
     def get_notification_service(
             self,
             orm_session: AsyncSession,
-            broker: AsyncBroker,
+            outbox: OutboxService,
             email_factory: EmailFactory,
     ) -> NotificationService:
         return NotificationService(
             session=orm_session,
-            broker=broker,
+            outbox=outbox,
             email_factory=email_factory,
         )
@@ -0,0 +1,48 @@
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from sqlalchemy import Executable
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def _iter_index_names(plan: dict[str, Any]) -> Iterator[str]:
+    if "Index Name" in plan:
+        yield plan["Index Name"]
+    for child in plan.get("Plans", ()):
+        yield from _iter_index_names(child)
+
+
+class QueryPlansService:
+    """
+    Explains statements to catch the ones left without index.
+
+    Statements are explained as the planner sees them, callers pass the
+    ones their handlers execute.  Plans depend on table statistics, so
+    they are only meaningful on a dataset of a realistic size.
+    """
+
+    def __init__(
+            self,
+            session: AsyncSession,
+    ):
+        self._session = session
+
+    async def explain(
+            self,
+            statements: Mapping[str, Executable],
+    ) -> dict[str, list[str]]:
+        """ Names of the indexes used by every statement """
+
+        connection = await self._session.connection()
+        indexes: dict[str, list[str]] = {}
+        for name, stmt in statements.items():
+            # parameters are inlined, so the plan is made for the values
+            compiled = stmt.compile(
+                dialect=connection.dialect,
+                compile_kwargs={"literal_binds": True},
+            )
+            plan = (await connection.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {compiled}",
+            )).scalar_one()
+            indexes[name] = list(_iter_index_names(plan[0]["Plan"]))
+        return indexes
@@ -0,0 +1,39 @@
+from redis.asyncio import Redis as AsyncRedis
+
+from hack.core.providers import ConfigPostgres
+
+
+class ReadYourWrites:
+    """
+    Remembers login sessions which wrote recently.
+
+    Reads of such a session are served by the primary for
+    `read_your_writes_window` seconds, the replica may not have its
+    writes yet.  Without a replica nothing is tracked.
+    """
+
+    def __init__(
+            self,
+            config: ConfigPostgres,
+            redis_client: AsyncRedis,
+    ):
+        self._enabled = (
+            config.has_replica
+            and config.read_your_writes_window > 0
+        )
+        self._window_ms = int(config.read_your_writes_window * 1000)
+        self._redis = redis_client
+
+    async def mark_write(self, writer: str) -> None:
+        if not self._enabled:
+            return
+        await self._redis.set(self._key(writer), 1, px=self._window_ms)
+
+    async def wrote_recently(self, writer: str) -> bool:
+        if not self._enabled:
+            return False
+        return bool(await self._redis.exists(self._key(writer)))
+
+    @staticmethod
+    def _key(writer: str) -> str:
+        return f"recent_write:{writer}"
@@ -0,0 +1,330 @@
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import Float, Integer, Select, cast, func, select
+from sqlalchemy.dialects.postgresql import array, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hack.core.models import (
+    Event,
+    EventParticipant,
+    StatisticsCounter,
+    StatisticsDailyRollup,
+    StatisticsSnapshot,
+)
+from hack.core.providers import ReadOnlySession
+from hack.core.services.statistics_cache import (
+    CachedEventsCounts,
+    CachedUserParticipations,
+    StatisticsCache,
+)
+from hack.core.services.statistics_counters import UNIQUE_PARTICIPANTS
+
+
+def _safe_int(value: int | None) -> int:
+    return int(value or 0)
+
+
+def _format_percent(value: float) -> str:
+    return f"{value * 100:g}"
+
+
+def _build_histogram(
+        name: str,
+        edges: Sequence[float],
+        counts: dict[int, int],
+        integer: bool,
+) -> dict[str, Any]:
+    """
+    Make bins out of `width_bucket` counts.
+
+    Bin `i` covers `[edges[i], edges[i + 1])`, the last one is open.
+    Integer bins are labeled with inclusive bounds, e.g. `2-3`.
+    """
+
+    bins: list[dict[str, Any]] = []
+    for i, start in enumerate(edges):
+        end = edges[i + 1] if i + 1 < len(edges) else None
+        if integer:
+            to_value = end - 1 if end is not None else None
+            if to_value is None:
+                label = f"{start}+"
+            elif to_value == start:
+                label = f"{start}"
+            else:
+                label = f"{start}-{to_value}"
+        else:
+            to_value = end
+            if end is None:
+                label = f"{_format_percent(start)}%+"
+            else:
+                label = f"{_format_percent(start)}-{_format_percent(end)}%"
+        bins.append({
+            "label": label,
+            "from_value": float(start),
+            "to_value": float(to_value) if to_value is not None else None,
+            # width_bucket numbers buckets from 1, 0 is below the first edge
+            "count": counts.get(i + 1, 0),
+        })
+    return {
+        "name": name,
+        "bins": bins,
+    }
+
+
+def build_user_participations_query(user_id: int, now: datetime) -> Select:
+    upcoming = Event.ends_at > now
+    return (
+        select(
+            func.count(EventParticipant.id)
+            .label("participating_events"),
+            func.count(EventParticipant.id)
+            .filter(upcoming)
+            .label("upcoming_participations"),
+            func.min(Event.ends_at)
+            .filter(upcoming)
+            .label("next_ends_at"),
+        )
+        .join(Event, Event.id == EventParticipant.event_id)
+        .where(EventParticipant.user_id == user_id)
+        .where(
+            EventParticipant.status
+            == EventParticipant.ParticipationStatusEnum.PARTICIPATING,
+        )
+        .where(Event.rejected_at.is_(None))
+    )
+
+
+class StatisticsService:
+    """
+    Computes admin statistics and keeps their snapshot.
+
+    The snapshot is refreshed by `refresh_statistics_snapshot` task, so
+    readers get the last computed payload without touching the events.
+    The snapshot and histograms are read from the replica.  Statistics
+    of users are served through `StatisticsCache`, they are filled from
+    the primary so a lagging replica is never cached.
+    """
+
+    ADMIN_SNAPSHOT = "admin"
+    # lower edges of histogram bins, the last bin is open ended
+    PARTICIPANTS_EDGES: tuple[int, ...] = (0, 1, 2, 4, 6)
+    FILL_RATE_EDGES: tuple[float, ...] = (0.0, 0.25, 0.5, 0.75, 1.0)
+
+    def __init__(
+            self,
+            session: AsyncSession,
+            read_only_session: ReadOnlySession,
+            cache: StatisticsCache,
+    ):
+        self._session = session
+        self._read_only_session = read_only_session
+        self._cache = cache
+
+    async def get_events_counts(self) -> CachedEventsCounts:
+        entry = self._cache.get_events_counts()
+        if entry is not None:
+            return entry
+
+        totals = (await self._session.execute(
+            select(
+                func.coalesce(func.sum(StatisticsDailyRollup.events), 0)
+                .label("events"),
+                func.coalesce(func.sum(StatisticsDailyRollup.past_events), 0)
+                .label("past_events"),
+            )
+        )).one()
+        entry = CachedEventsCounts(
+            total_events=totals.events,
+            active_events=totals.events - totals.past_events,
+            past_events=totals.past_events,
+        )
+        self._cache.put_events_counts(entry)
+        return entry
+
+    async def get_user_participations(
+            self,
+            user_id: int,
+    ) -> CachedUserParticipations:
+        entry = await self._cache.get_user_participations(user_id)
+        if entry is not None:
+            return entry
+
+        now = datetime.now(tz=timezone.utc)
+        counts = (await self._session.execute(
+            build_user_participations_query(user_id, now),
+        )).one()
+        entry = CachedUserParticipations(
+            participating_events=counts.participating_events,
+            upcoming_participations=counts.upcoming_participations,
+            next_ends_at=counts.next_ends_at,
+        )
+        await self._cache.put_user_participations(user_id, entry)
+        return entry
+
+    async def get_admin_snapshot(self) -> StatisticsSnapshot | None:
+        return await self._read_only_session.get(
+            StatisticsSnapshot,
+            self.ADMIN_SNAPSHOT,
+        )
+
+    async def refresh_admin_snapshot(self) -> StatisticsSnapshot:
+        payload = await self.compute_admin()
+        computed_at = datetime.now(tz=timezone.utc)
+        stmt = insert(StatisticsSnapshot).values(
+            name=self.ADMIN_SNAPSHOT,
+            payload=payload,
+            computed_at=computed_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StatisticsSnapshot.name],
+            set_={
+                "payload": stmt.excluded.payload,
+                "computed_at": stmt.excluded.computed_at,
+            },
+        )
+        await self._session.execute(stmt)
+        return StatisticsSnapshot(
+            name=self.ADMIN_SNAPSHOT,
+            payload=payload,
+            computed_at=computed_at,
+        )
+
+    async def compute_admin(self) -> dict[str, Any]:
+        """
+        Build the payload from the counters kept on write.
+
+        Only the daily rollups are read, so the cost depends on the
+        number of days with events, not on events or participations.
+        """
+
+        timeline = list(await self._session.execute(
+            select(
+                StatisticsDailyRollup.day,
+                StatisticsDailyRollup.events,
+                StatisticsDailyRollup.past_events,
+                StatisticsDailyRollup.rejected_events,
+                StatisticsDailyRollup.participations,
+            )
+            .order_by(StatisticsDailyRollup.day)
+        ))
+        unique_participants = await self._session.scalar(
+            select(StatisticsCounter.value)
+            .where(StatisticsCounter.name == UNIQUE_PARTICIPANTS)
+        )
+
+        events_total = sum(row.events for row in timeline)
+        past_events = sum(row.past_events for row in timeline)
+        rejected_events = sum(row.rejected_events for row in timeline)
+        total_participations = sum(row.participations for row in timeline)
+        avg_participants_per_event = (
+            total_participations / events_total
+            if events_total
+            else 0.0
+        )
+        # days with rejected or moved events only are not plotted
+        timeline = [row for row in timeline if row.events]
+
+        return {
+            "scalars": [
+                {
+                    "name": "events_total",
+                    "value": events_total,
+                },
+                {
+                    "name": "active_events",
+                    "value": events_total - past_events,
+                },
+                {
+                    "name": "past_events",
+                    "value": past_events,
+                },
+                {
+                    "name": "rejected_events",
+                    "value": rejected_events,
+                },
+                {
+                    "name": "total_participations",
+                    "value": total_participations,
+                },
+                {
+                    "name": "unique_participants",
+                    "value": _safe_int(unique_participants),
+                },
+                {
+                    "name": "avg_participants_per_event",
+                    "value": avg_participants_per_event,
+                },
+            ],
+            "graphs": [
+                {
+                    "name": "events_by_start_date",
+                    "points": [
+                        {"x": row.day.isoformat(), "y": row.events}
+                        for row in timeline
+                    ],
+                },
+                {
+                    "name": "participants_by_start_date",
+                    "points": [
+                        {"x": row.day.isoformat(), "y": row.participations}
+                        for row in timeline
+                    ],
+                },
+            ],
+            "histograms": await self.compute_histograms(),
+        }
+
+    async def compute_histograms(
+            self,
+            participants_edges: Sequence[int] | None = None,
+            fill_rate_edges: Sequence[float] | None = None,
+    ) -> list[dict[str, Any]]:
+        """ Bucket events in SQL, only the counts leave the database """
+
+        participants_edges = participants_edges or self.PARTICIPANTS_EDGES
+        fill_rate_edges = fill_rate_edges or self.FILL_RATE_EDGES
+
+        participants_bucket = func.width_bucket(
+            Event.participants_count,
+            array(participants_edges, type_=Integer),
+        ).label("bucket")
+        participants_counts = await self._count_buckets(
+            select(participants_bucket, func.count())
+            .where(Event.rejected_at.is_(None))
+            .group_by("bucket")
+        )
+
+        fill_rate_bucket = func.width_bucket(
+            cast(Event.participants_count, Float)
+            .op("/")(Event.max_participants_count),
+            array(fill_rate_edges, type_=Float),
+        ).label("bucket")
+        fill_rate_counts = await self._count_buckets(
+            select(fill_rate_bucket, func.count())
+            .where(Event.rejected_at.is_(None))
+            .where(Event.max_participants_count > 0)
+            .group_by("bucket")
+        )
+
+        return [
+            _build_histogram(
+                "participants_per_event",
+                participants_edges,
+                participants_counts,
+                integer=True,
+            ),
+            _build_histogram(
+                "capacity_fill_rate",
+                fill_rate_edges,
+                fill_rate_counts,
+                integer=False,
+            ),
+        ]
+
+    async def _count_buckets(self, stmt: Select) -> dict[int, int]:
+        return {
+            bucket: count
+            for bucket, count in await self._read_only_session.execute(stmt)
+        }
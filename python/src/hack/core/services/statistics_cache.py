@@ -0,0 +1,122 @@
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from pydantic import BaseModel
+from redis.asyncio import Redis as AsyncRedis
+
+from hack.core.providers import ConfigStatisticsCache
+
+
+class CachedEventsCounts(BaseModel):
+    """ Events counts shared by all users """
+
+    total_events: int
+    active_events: int
+    past_events: int
+
+
+class CachedUserParticipations(BaseModel):
+    """ Participations summary of a single user """
+
+    participating_events: int
+    upcoming_participations: int
+    # the summary is stale once the nearest upcoming event ends
+    next_ends_at: datetime | None
+
+
+class StatisticsCache:
+    """
+    Cache behind `GET /users/me/statistics`.
+
+    Events counts are kept in process for `global_ttl` and dropped by
+    local writes, so other processes see changes after at most the
+    TTL.  Participation summaries live in Redis until the user's
+    participations change or the nearest upcoming event ends.
+    """
+
+    def __init__(
+            self,
+            config: ConfigStatisticsCache,
+            redis_client: AsyncRedis,
+    ):
+        self._config = config
+        self._redis = redis_client
+        self._events_counts: tuple[float, CachedEventsCounts] | None = None
+        self.hits_local = 0
+        self.hits_redis = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_events_counts(self) -> CachedEventsCounts | None:
+        if not self._config.enabled or self._events_counts is None:
+            return None
+        expires_at, entry = self._events_counts
+        if expires_at <= time.monotonic():
+            self._events_counts = None
+            return None
+        self.hits_local += 1
+        return entry
+
+    def put_events_counts(self, entry: CachedEventsCounts) -> None:
+        if not self._config.enabled:
+            return
+        expires_at = time.monotonic() + self._config.global_ttl
+        self._events_counts = (expires_at, entry)
+
+    def invalidate_events_counts(self) -> None:
+        self._events_counts = None
+
+    async def get_user_participations(
+            self,
+            user_id: int,
+    ) -> CachedUserParticipations | None:
+        if not self._config.enabled:
+            return None
+
+        raw = await self._redis.get(self._user_key(user_id))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits_redis += 1
+        return CachedUserParticipations.model_validate_json(raw)
+
+    async def put_user_participations(
+            self,
+            user_id: int,
+            entry: CachedUserParticipations,
+    ) -> None:
+        if not self._config.enabled:
+            return
+
+        ttl = self._config.user_ttl
+        if entry.next_ends_at is not None:
+            next_ends_at = entry.next_ends_at
+            if next_ends_at.tzinfo is None:
+                next_ends_at = next_ends_at.replace(tzinfo=timezone.utc)
+            until_end = next_ends_at - datetime.now(tz=timezone.utc)
+            ttl = max(1, min(ttl, int(until_end.total_seconds())))
+        await self._redis.set(
+            self._user_key(user_id),
+            entry.model_dump_json(),
+            ex=ttl,
+        )
+
+    async def invalidate_users(self, user_ids: Iterable[int]) -> None:
+        keys = [self._user_key(user_id) for user_id in set(user_ids)]
+        if not keys:
+            return
+        self.invalidations += 1
+        await self._redis.delete(*keys)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits_local": self.hits_local,
+            "hits_redis": self.hits_redis,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+    @staticmethod
+    def _user_key(user_id: int) -> str:
+        return f"user_statistics:{user_id}"
@@ -0,0 +1,381 @@
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from sqlalchemy import and_, delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hack.core.models import (
+    Event,
+    EventParticipant,
+    StatisticsCounter,
+    StatisticsDailyRollup,
+    StatisticsUserParticipations,
+)
+
+UNIQUE_PARTICIPANTS = "unique_participants"
+
+_ROLLUP_FIELDS = ("events", "past_events", "rejected_events", "participations")
+
+
+def _utc_date(value: datetime) -> date:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.date()
+
+
+@dataclass(frozen=True)
+class EventCounters:
+    """ Contribution of a single event to the daily rollups """
+
+    day: date
+    rejected: bool
+    past: bool
+    participants: int
+
+    @classmethod
+    def of(cls, event: Event) -> "EventCounters":
+        return cls(
+            day=_utc_date(event.starts_at),
+            rejected=event.rejected_at is not None,
+            past=event.statistics_past,
+            participants=event.participants_count,
+        )
+
+    def as_rollup(self) -> dict[str, int]:
+        if self.rejected:
+            return {
+                "events": 0,
+                "past_events": 0,
+                "rejected_events": 1,
+                "participations": 0,
+            }
+        return {
+            "events": 1,
+            "past_events": int(self.past),
+            "rejected_events": 0,
+            "participations": self.participants,
+        }
+
+
+class StatisticsCountersService:
+    """
+    Maintains statistics counters on write.
+
+    Writers pass the contribution of an event before and after their
+    change, only the difference is applied with `INSERT ... ON CONFLICT`
+    increments.  Events move from active to past in `roll_over`, which
+    flips `Event.statistics_past` so every event is counted once.
+    `check` compares counters with a full recomputation and `rebuild`
+    replaces them with it.
+    """
+
+    ROLL_OVER_BATCH_SIZE = 1000
+
+    def __init__(
+            self,
+            session: AsyncSession,
+    ):
+        self._session = session
+
+    async def track_event(
+            self,
+            before: EventCounters | None,
+            after: EventCounters | None,
+    ) -> None:
+        deltas: dict[date, Counter] = {}
+        for counters, sign in ((before, -1), (after, 1)):
+            if counters is None:
+                continue
+            day_deltas = deltas.setdefault(counters.day, Counter())
+            for field, value in counters.as_rollup().items():
+                day_deltas[field] += sign * value
+        await self._add_rollups(deltas)
+
+    async def track_participants(
+            self,
+            user_ids: Iterable[int],
+            delta: int,
+    ) -> None:
+        """ Count one more (`delta=1`) or one less (`-1`) participation """
+
+        user_ids = sorted(set(user_ids))
+        if not user_ids:
+            return
+
+        stmt = insert(StatisticsUserParticipations).values([
+            {"user_id": user_id, "participations": delta}
+            for user_id in user_ids
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StatisticsUserParticipations.user_id],
+            set_={
+                "participations": (
+                    StatisticsUserParticipations.participations
+                    + stmt.excluded.participations
+                ),
+            },
+        ).returning(StatisticsUserParticipations.participations)
+        participations = await self._session.scalars(stmt)
+
+        # users who got their first participation or lost the last one
+        edge = 1 if delta > 0 else 0
+        changed = sum(1 for value in participations if value == edge)
+        if changed:
+            await self._add_counter(UNIQUE_PARTICIPANTS, changed * delta)
+
+    async def track_participation(
+            self,
+            counters: EventCounters,
+            user_id: int,
+            delta: int,
+    ) -> None:
+        """
+        Count a participant joining (`delta=1`) or leaving (`-1`).
+
+        The delta is fixed: `participants_count` returned by the seat
+        update may include joins of concurrent transactions, those are
+        counted by their own transactions.
+        """
+
+        if not counters.rejected:
+            await self._add_rollups({
+                counters.day: Counter(participations=delta),
+            })
+        await self.track_participants([user_id], delta)
+
+    async def track_roster(
+            self,
+            event_id: int,
+            before: EventCounters,
+            after: EventCounters,
+            added_ids: list[int],
+            removed_ids: list[int],
+    ) -> None:
+        """ Count participants of an edited event, call after the edit """
+
+        if before.rejected and after.rejected:
+            return
+        if not before.rejected and not after.rejected:
+            await self.track_participants(added_ids, 1)
+            await self.track_participants(removed_ids, -1)
+            return
+
+        # rejected or restored: the whole roster changes its contribution
+        roster = set(await self._session.scalars(
+            select(EventParticipant.user_id)
+            .where(EventParticipant.event_id == event_id)
+            .where(
+                EventParticipant.status
+                == EventParticipant.ParticipationStatusEnum.PARTICIPATING
+            )
+        ))
+        if after.rejected:
+            roster_before = roster - set(added_ids) | set(removed_ids)
+            await self.track_participants(roster_before, -1)
+        else:
+            await self.track_participants(roster, 1)
+
+    async def roll_over(self, now: datetime) -> int:
+        """ Count events that ended by `now` as past, returns their number """
+
+        pending = (
+            select(Event.id)
+            .where(~Event.statistics_past)
+            .where(Event.ends_at <= now)
+            .limit(self.ROLL_OVER_BATCH_SIZE)
+            # events being edited are picked up by the next batch
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Event)
+            .where(Event.id.in_(pending.scalar_subquery()))
+            .values(statistics_past=True)
+            .returning(Event.starts_at, Event.rejected_at)
+            .execution_options(synchronize_session=False)
+        )
+        rows = list(await self._session.execute(stmt))
+        past_by_day = Counter(
+            _utc_date(row.starts_at)
+            for row in rows
+            if row.rejected_at is None
+        )
+        await self._add_rollups({
+            day: Counter(past_events=count)
+            for day, count in past_by_day.items()
+        })
+        return len(rows)
+
+    async def check(self) -> list[str]:
+        """ Describe counters which differ from a full recomputation """
+
+        mismatches: list[str] = []
+
+        stored = {
+            row.day: tuple(getattr(row, field) for field in _ROLLUP_FIELDS)
+            for row in await self._session.scalars(
+                select(StatisticsDailyRollup)
+            )
+            # days emptied by moved events are kept as zero rows
+            if any(getattr(row, field) for field in _ROLLUP_FIELDS)
+        }
+        actual = {
+            row.day: tuple(getattr(row, field) for field in _ROLLUP_FIELDS)
+            for row in await self._session.execute(self._actual_rollups())
+        }
+        for day in sorted(stored.keys() | actual.keys()):
+            if stored.get(day) != actual.get(day):
+                mismatches.append(
+                    f"rollup {day}: {stored.get(day)} != {actual.get(day)}"
+                )
+
+        actual_users = self._actual_user_participations().subquery()
+        stored_users = StatisticsUserParticipations
+        drifted_users = await self._session.scalar(
+            select(func.count())
+            .select_from(stored_users)
+            .join(
+                actual_users,
+                actual_users.c.user_id == stored_users.user_id,
+                full=True,
+            )
+            .where(
+                func.coalesce(stored_users.participations, 0)
+                != func.coalesce(actual_users.c.participations, 0)
+            )
+        )
+        if drifted_users:
+            mismatches.append(f"user participations: {drifted_users} users")
+
+        stored_unique = await self._session.scalar(
+            select(StatisticsCounter.value)
+            .where(StatisticsCounter.name == UNIQUE_PARTICIPANTS)
+        ) or 0
+        actual_unique = await self._session.scalar(
+            select(func.count()).select_from(actual_users)
+        )
+        if stored_unique != actual_unique:
+            mismatches.append(
+                f"{UNIQUE_PARTICIPANTS}: {stored_unique} != {actual_unique}"
+            )
+        return mismatches
+
+    async def rebuild(self) -> None:
+        # writers wait for the rebuild, then add their deltas on top
+        await self._session.execute(text(
+            "LOCK TABLE statistics_daily_rollup, "
+            "statistics_user_participations, statistics_counter "
+            "IN EXCLUSIVE MODE"
+        ))
+        await self._session.execute(delete(StatisticsDailyRollup))
+        await self._session.execute(
+            insert(StatisticsDailyRollup).from_select(
+                ["day", *_ROLLUP_FIELDS],
+                self._actual_rollups(),
+            )
+        )
+        await self._session.execute(delete(StatisticsUserParticipations))
+        await self._session.execute(
+            insert(StatisticsUserParticipations).from_select(
+                ["user_id", "participations"],
+                self._actual_user_participations(),
+            )
+        )
+        unique_participants = await self._session.scalar(
+            select(func.count()).select_from(StatisticsUserParticipations)
+        )
+        stmt = insert(StatisticsCounter).values(
+            name=UNIQUE_PARTICIPANTS,
+            value=unique_participants,
+        )
+        await self._session.execute(stmt.on_conflict_do_update(
+            index_elements=[StatisticsCounter.name],
+            set_={"value": stmt.excluded.value},
+        ))
+
+    async def _add_rollups(self, deltas: dict[date, Counter]) -> None:
+        # sorted, so concurrent writers lock the day rows in one order
+        rows = [
+            {"day": day, **{field: delta[field] for field in _ROLLUP_FIELDS}}
+            for day, delta in sorted(deltas.items())
+            if any(delta[field] for field in _ROLLUP_FIELDS)
+        ]
+        if not rows:
+            return
+
+        stmt = insert(StatisticsDailyRollup).values(rows)
+        await self._session.execute(stmt.on_conflict_do_update(
+            index_elements=[StatisticsDailyRollup.day],
+            set_={
+                field: (
+                    getattr(StatisticsDailyRollup, field)
+                    + getattr(stmt.excluded, field)
+                )
+                for field in _ROLLUP_FIELDS
+            },
+        ))
+
+    async def _add_counter(self, name: str, delta: int) -> None:
+        stmt = insert(StatisticsCounter).values(name=name, value=delta)
+        await self._session.execute(stmt.on_conflict_do_update(
+            index_elements=[StatisticsCounter.name],
+            set_={"value": StatisticsCounter.value + stmt.excluded.value},
+        ))
+
+    @staticmethod
+    def _actual_rollups():
+        participations = (
+            select(
+                EventParticipant.event_id,
+                func.count().label("participations"),
+            )
+            .where(
+                EventParticipant.status
+                == EventParticipant.ParticipationStatusEnum.PARTICIPATING
+            )
+            .group_by(EventParticipant.event_id)
+            .subquery()
+        )
+        not_rejected = Event.rejected_at.is_(None)
+        day = func.date(Event.starts_at)
+        return (
+            select(
+                day.label("day"),
+                func.count().filter(not_rejected).label("events"),
+                func.count()
+                .filter(and_(not_rejected, Event.statistics_past))
+                .label("past_events"),
+                func.count()
+                .filter(Event.rejected_at.is_not(None))
+                .label("rejected_events"),
+                func.coalesce(
+                    func.sum(participations.c.participations)
+                    .filter(not_rejected),
+                    0,
+                ).label("participations"),
+            )
+            .select_from(Event)
+            .outerjoin(
+                participations,
+                participations.c.event_id == Event.id,
+            )
+            .group_by(day)
+        )
+
+    @staticmethod
+    def _actual_user_participations():
+        return (
+            select(
+                EventParticipant.user_id,
+                func.count().label("participations"),
+            )
+            .join(Event, Event.id == EventParticipant.event_id)
+            .where(
+                EventParticipant.status
+                == EventParticipant.ParticipationStatusEnum.PARTICIPATING
+            )
+            .where(Event.rejected_at.is_(None))
+            .group_by(EventParticipant.user_id)
+        )
@@ -298,6 +298,13 @@ def make_get_event() -> PatchedRequest:
     )
 
 
+def make_list_event_participants() -> PatchedRequest:
+    return PatchedRequest(
+        method="GET",
+        url=_base_url + "/events/{event_id}/participants",
+    )
+
+
 def make_update_event() -> PatchedRequest:
     return PatchedRequest(
         method="PUT",
@@ -335,6 +342,27 @@ def make_export_event_participants() -> PatchedRequest:
     )
 
 
+def make_create_event_participants_export_job() -> PatchedRequest:
+    return PatchedRequest(
+        method="POST",
+        url=_base_url + "/events/{event_id}/participants/export-jobs",
+    )
+
+
+def make_create_export_job() -> PatchedRequest:
+    return PatchedRequest(
+        method="POST",
+        url=_base_url + "/export-jobs",
+    )
+
+
+def make_get_export_job() -> PatchedRequest:
+    return PatchedRequest(
+        method="GET",
+        url=_base_url + "/export-jobs/{job_id}",
+    )
+
+
 # ---------- NOTIFICATIONS ----------
 
 def make_list_instant_notifications() -> PatchedRequest:
@@ -365,3 +393,45 @@ def make_get_admin_statistics() -> PatchedRequest:
         method="GET",
         url=_base_url + "/statistics",
     )
+
+
+def make_check_statistics_counters() -> PatchedRequest:
+    return PatchedRequest(
+        method="GET",
+        url=_base_url + "/debug/statistics-counters/check",
+    )
+
+
+def make_drift_participants_count() -> PatchedRequest:
+    return PatchedRequest(
+        method="POST",
+        url=_base_url + "/debug/events/{event_id}/drift-participants-count",
+    )
+
+
+def make_reconcile_participants_counts() -> PatchedRequest:
+    return PatchedRequest(
+        method="POST",
+        url=_base_url + "/debug/participants-counts/reconcile",
+    )
+
+
+def make_get_query_plans() -> PatchedRequest:
+    return PatchedRequest(
+        method="GET",
+        url=_base_url + "/debug/query-plans",
+    )
+
+
+def make_get_metrics() -> PatchedRequest:
+    return PatchedRequest(
+        method="GET",
+        url=_base_url + "/debug/metrics",
+    )
+
+
+def make_seed_examples() -> PatchedRequest:
+    return PatchedRequest(
+        method="POST",
+        url=_base_url + "/debug/seed-examples",
+    )
@@ -1,8 +1,11 @@
 import csv
 import io
+import time
+import zipfile
 from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
+import requests
 from openpyxl import load_workbook
 
 from . import api_templates
@@ -93,3 +96,89 @@ def test_export_event_participants_csv_and_xlsx(admin_client):
     emails = [row[1] for row in data_rows]
     assert participant_email in emails
     assert rejected_email not in emails
+
+
+def _create_event_with_participant(admin_client, participant_id: int) -> int:
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": "Export job event",
+        "description": "Testing export jobs",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=2)).isoformat(),
+        "image_url": "https://example.com/export-job.png",
+        "participants_ids": [participant_id],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+    return r.json()["id"]
+
+
+def _wait_export_job(admin_client, job_id: int, timeout: float = 30.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        req = api_templates.make_get_export_job()
+        req.path_params = {"job_id": job_id}
+        r = admin_client.prepsend(req)
+        assert r.status_code == 200
+        job = r.json()
+        if job["status"] in ("DONE", "FAILED"):
+            return job
+        assert time.monotonic() < deadline, job
+        time.sleep(0.5)
+
+
+def test_export_jobs_upload_to_s3(admin_client):
+    participant_email = f"participant-{uuid4()}@example.com"
+    make_authed_client(default_email=participant_email)
+
+    req = api_templates.make_list_users()
+    req.params = {"limit": 200}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    users_by_email = {item["email"]: item for item in r.json()}
+    participant_id = users_by_email[participant_email]["id"]
+
+    event_ids = [
+        _create_event_with_participant(admin_client, participant_id)
+        for _ in range(2)
+    ]
+
+    req = api_templates.make_create_event_participants_export_job()
+    req.path_params = {"event_id": event_ids[0]}
+    req.params = {"format": "csv"}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 202
+    assert r.json()["status"] == "PENDING"
+    assert r.json()["download_url"] is None
+
+    job = _wait_export_job(admin_client, r.json()["id"])
+    assert job["status"] == "DONE", job
+    r = requests.get(job["download_url"], verify=False)
+    assert r.status_code == 200
+    rows = list(csv.reader(io.StringIO(r.content.decode())))
+    assert len(rows) == 2
+    assert rows[1][1] == participant_email
+
+    req = api_templates.make_create_export_job()
+    req.json = {"event_ids": event_ids, "format": "xlsx"}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 202
+
+    job = _wait_export_job(admin_client, r.json()["id"])
+    assert job["status"] == "DONE", job
+    r = requests.get(job["download_url"], verify=False)
+    assert r.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(r.content))
+    assert sorted(archive.namelist()) == sorted(
+        f"event_{event_id}_participants.xlsx" for event_id in event_ids
+    )
+    for name in archive.namelist():
+        sheet = load_workbook(io.BytesIO(archive.read(name))).active
+        emails = [row[1] for row in list(sheet.values)[1:]]
+        assert emails == [participant_email]
+
+    req = api_templates.make_create_export_job()
+    req.json = {"event_ids": [event_ids[0], -1]}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 404
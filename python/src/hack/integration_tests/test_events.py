@@ -83,3 +83,64 @@ def test_events_crud(admin_client):
     r = admin_client.prepsend(req)
     assert r.status_code == 200
     assert any(item["id"] == event_id for item in r.json())
+
+
+def test_events_list_pagination(admin_client):
+    emails = [f"participant-{uuid4()}@example.com" for _ in range(3)]
+    for email in emails:
+        make_authed_client(default_email=email)
+    req = api_templates.make_list_users()
+    req.params = {"limit": 200}
+    r = admin_client.prepsend(req)
+    users_by_email = {item["email"]: item["id"] for item in r.json()}
+    participant_ids = [users_by_email[i] for i in emails]
+
+    marker = str(uuid4())
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    event_ids = []
+    for i in range(3):
+        req = api_templates.make_create_event()
+        req.json = {
+            "name": f"Listed {marker} {i}",
+            "description": "desc",
+            "starts_at": (starts_at + timedelta(minutes=i)).isoformat(),
+            "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+            "image_url": "https://example.com/image.png",
+            "participants_ids": participant_ids,
+        }
+        r = admin_client.prepsend(req)
+        assert r.status_code == 201
+        event_ids.append(r.json()["id"])
+
+    # newest first, two per page, counts only
+    req = api_templates.make_list_events()
+    req.params = {
+        "name": marker,
+        "sort": "starts_at",
+        "order": "desc",
+        "include_participants": False,
+        "limit": 2,
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    page = r.json()
+    assert [i["id"] for i in page] == event_ids[:0:-1]
+    assert all(i["participants"] is None for i in page)
+    assert all(i["participants_count"] == 3 for i in page)
+
+    req.params["cursor"] = r.headers["X-Next-Cursor"]
+    r = admin_client.prepsend(req)
+    assert [i["id"] for i in r.json()] == event_ids[:1]
+    assert "X-Next-Cursor" not in r.headers
+
+    # participants of one event page by page
+    req = api_templates.make_list_event_participants()
+    req.path_params = {"event_id": event_ids[0]}
+    req.params = {"limit": 2}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    seen = [i["user_id"] for i in r.json()]
+    req.params["cursor"] = r.headers["X-Next-Cursor"]
+    r = admin_client.prepsend(req)
+    seen += [i["user_id"] for i in r.json()]
+    assert sorted(seen) == sorted(participant_ids)
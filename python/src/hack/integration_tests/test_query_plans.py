@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from . import api_templates
+from .conftest import make_authed_client
+
+EXPECTED_INDEXES = {
+    "event_cards": {"ix_event_starts_at_id"},
+    "admin_events_by_start": {"ix_event_starts_at_id"},
+    # both lead with `event_id`, the planner picks either of them
+    "event_participants": {
+        "ix_event_participant_event_id_status",
+        "event_participant_unique",
+    },
+    "user_participations": {"ix_event_participant_user_id"},
+    "pending_reminders": {"ix_event_participant_reminder_pending"},
+    "unread_notifications": {"ix_instant_notification_unread"},
+    "all_notifications": {
+        "ix_instant_notification_recipient_id_created_at",
+    },
+}
+
+
+def test_hot_queries_use_indexes(admin_client):
+    req = api_templates.make_seed_examples()
+    req.json = {}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 204
+
+    user_client = make_authed_client(
+        default_email=f"plans-user-{uuid4()}@example.com",
+    )
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": "Query plans event",
+        "description": "Subject of the explained queries",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+        "image_url": "https://example.com/plans.png",
+        "participants_ids": [],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+    event_id = r.json()["id"]
+
+    req = api_templates.make_update_my_participation()
+    req.path_params = {"event_id": event_id}
+    req.json = {"status": "PARTICIPATING"}
+    r = user_client.prepsend(req)
+    assert r.status_code == 204
+
+    req = api_templates.make_list_event_participants()
+    req.path_params = {"event_id": event_id}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    user_id = r.json()[0]["user_id"]
+
+    req = api_templates.make_get_query_plans()
+    req.params = {"user_id": user_id, "event_id": event_id}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    indexes = r.json()
+    for query, expected in EXPECTED_INDEXES.items():
+        assert expected & set(indexes[query]), (query, indexes[query])
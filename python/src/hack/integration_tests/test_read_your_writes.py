@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+
+from . import api_templates
+from .conftest import make_authed_client
+
+
+def get_replica_checkouts(client) -> int:
+    r = client.prepsend(api_templates.make_get_metrics())
+    assert r.status_code == 200
+    replica_pool = r.json().get("database_replica_pool")
+    if replica_pool is None:
+        pytest.skip(reason="Needs HACK__POSTGRES__REPLICA_HOST to be set")
+    return replica_pool["checkouts"]
+
+
+def test_login_reads_from_primary(admin_client):
+    checkouts = get_replica_checkouts(admin_client)
+    user_client = make_authed_client()
+    r = user_client.prepsend(api_templates.make_list_instant_notifications())
+    assert r.status_code == 200
+    assert get_replica_checkouts(admin_client) == checkouts
+
+
+def test_writer_reads_own_writes_from_primary(admin_client):
+    checkouts = get_replica_checkouts(admin_client)
+    name = f"Read your writes {uuid4()}"
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": name,
+        "description": "Read right after it is created",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+        "image_url": "https://example.com/image.png",
+        "participants_ids": [],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+    event_id = r.json()["id"]
+
+    req = api_templates.make_list_events()
+    req.params = {"name": name}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    assert [i["id"] for i in r.json()] == [event_id]
+
+    req = api_templates.make_list_event_participants()
+    req.path_params = {"event_id": event_id}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    assert r.json() == []
+    assert get_replica_checkouts(admin_client) == checkouts
@@ -116,3 +116,190 @@ def test_statistics_endpoints(admin_client):
     fill_rate_bins = {item["label"]: item["count"] for item in histograms["capacity_fill_rate"]}
     assert fill_rate_bins["25-50%"] == 1
     assert fill_rate_bins["50-75%"] == 1
+
+
+def test_admin_statistics_snapshot(admin_client):
+    req = api_templates.make_get_admin_statistics()
+    req.params = {"fresh": "true"}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    stats = r.json()
+    assert stats["snapshot_age_seconds"] == 0
+    scalars = {item["name"]: item["value"] for item in stats["scalars"]}
+    events_total = scalars["events_total"]
+
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": "Snapshot event",
+        "description": "Fresh statistics see it right away",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+        "image_url": "https://example.com/snapshot.png",
+        "participants_ids": [],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+
+    req = api_templates.make_get_admin_statistics()
+    req.params = {"fresh": "true"}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    scalars = {item["name"]: item["value"] for item in r.json()["scalars"]}
+    assert scalars["events_total"] == events_total + 1
+
+    req = api_templates.make_get_admin_statistics()
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    stats = r.json()
+    assert stats["snapshot_age_seconds"] >= 0
+    assert {item["name"] for item in stats["histograms"]} == {
+        "participants_per_event",
+        "capacity_fill_rate",
+    }
+
+
+def test_admin_statistics_custom_histogram_edges(admin_client):
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": "Histogram event",
+        "description": "Event for custom bins",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+        "image_url": "https://example.com/histogram.png",
+        "max_participants_count": 4,
+        "participants_ids": [],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+
+    req = api_templates.make_get_admin_statistics()
+    req.params = {
+        "participants_edges": [0, 10],
+        "fill_rate_edges": [0, 0.5],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    histograms = {
+        item["name"]: item["bins"]
+        for item in r.json()["histograms"]
+    }
+
+    participants_bins = histograms["participants_per_event"]
+    assert [item["label"] for item in participants_bins] == ["0-9", "10+"]
+    assert participants_bins[0]["count"] >= 1
+
+    fill_rate_bins = histograms["capacity_fill_rate"]
+    assert [item["label"] for item in fill_rate_bins] == ["0-50%", "50%+"]
+    assert fill_rate_bins[0]["count"] >= 1
+
+    req = api_templates.make_get_admin_statistics()
+    req.params = {"participants_edges": [5, 1]}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 400
+
+
+def _admin_scalars(admin_client) -> dict[str, float]:
+    req = api_templates.make_get_admin_statistics()
+    req.params = {"fresh": "true"}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    return {item["name"]: item["value"] for item in r.json()["scalars"]}
+
+
+def test_statistics_counters_follow_writes(admin_client):
+    user_email = f"stat-user-{uuid4()}@example.com"
+    user_client = make_authed_client(default_email=user_email)
+
+    before = _admin_scalars(admin_client)
+
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": "Counters event",
+        "description": "Counters are kept on write",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+        "image_url": "https://example.com/counters.png",
+        "participants_ids": [],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+    event_id = r.json()["id"]
+
+    req = api_templates.make_update_my_participation()
+    req.path_params = {"event_id": event_id}
+    req.json = {"status": "PARTICIPATING"}
+    r = user_client.prepsend(req)
+    assert r.status_code == 204
+
+    after = _admin_scalars(admin_client)
+    assert after["events_total"] == before["events_total"] + 1
+    assert after["active_events"] == before["active_events"] + 1
+    assert after["total_participations"] == before["total_participations"] + 1
+    assert after["unique_participants"] == before["unique_participants"] + 1
+
+    req = api_templates.make_update_event()
+    req.path_params = {"event_id": event_id}
+    req.json = {"rejected_at": datetime.now(tz=timezone.utc).isoformat()}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+
+    rejected = _admin_scalars(admin_client)
+    assert rejected["events_total"] == before["events_total"]
+    assert rejected["rejected_events"] == before["rejected_events"] + 1
+    assert rejected["total_participations"] == before["total_participations"]
+    assert rejected["unique_participants"] == before["unique_participants"]
+
+    req = api_templates.make_check_statistics_counters()
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    assert r.json() == []
+
+
+def test_my_statistics_follow_participation_changes(admin_client):
+    user_email = f"stat-user-{uuid4()}@example.com"
+    user_client = make_authed_client(default_email=user_email)
+
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": "Cached statistics event",
+        "description": "User statistics are cached",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+        "image_url": "https://example.com/cached-statistics.png",
+        "participants_ids": [],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+    event_id = r.json()["id"]
+
+    # the second read is served from the cache
+    for _ in range(2):
+        r = user_client.prepsend(api_templates.make_get_my_statistics())
+        assert r.status_code == 200
+        assert r.json()["participating_events"] == 0
+
+    req = api_templates.make_update_my_participation()
+    req.path_params = {"event_id": event_id}
+    req.json = {"status": "PARTICIPATING"}
+    r = user_client.prepsend(req)
+    assert r.status_code == 204
+
+    r = user_client.prepsend(api_templates.make_get_my_statistics())
+    assert r.status_code == 200
+    assert r.json()["participating_events"] == 1
+    assert r.json()["upcoming_participations"] == 1
+
+    req = api_templates.make_update_event()
+    req.path_params = {"event_id": event_id}
+    req.json = {"rejected_at": datetime.now(tz=timezone.utc).isoformat()}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+
+    r = user_client.prepsend(api_templates.make_get_my_statistics())
+    assert r.status_code == 200
+    assert r.json()["participating_events"] == 0
+    assert r.json()["upcoming_participations"] == 0
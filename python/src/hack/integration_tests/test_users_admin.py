@@ -106,3 +106,42 @@ def test_users_admin_flow(admin_client):
     }
     r = admin_client.prepsend(req)
     assert r.status_code == 201
+
+
+def test_login_session_follows_user_changes(admin_client):
+    user_email = f"session-user-{uuid4()}@example.com"
+    user_client = make_authed_client(default_email=user_email)
+
+    # warm up session resolution before changing the user
+    req = api_templates.make_get_active_login()
+    r = user_client.prepsend(req)
+    assert r.status_code == 200
+    assert r.json()["role"] == "USER"
+
+    req = api_templates.make_list_users()
+    req.params = {"limit": 200}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    user_id = next(u["id"] for u in r.json() if u["email"] == user_email)
+
+    # role change is visible to the already resolved session
+    req = api_templates.make_update_user()
+    req.path_params = {"user_id": user_id}
+    req.json = {"role": "ADMINISTRATOR"}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+
+    req = api_templates.make_get_active_login()
+    r = user_client.prepsend(req)
+    assert r.status_code == 200
+    assert r.json()["role"] == "ADMINISTRATOR"
+
+    # soft deletion revokes the session immediately
+    req = api_templates.make_delete_user()
+    req.path_params = {"user_id": user_id}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 204
+
+    req = api_templates.make_get_active_login()
+    r = user_client.prepsend(req)
+    assert r.status_code == 401
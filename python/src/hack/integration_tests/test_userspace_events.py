@@ -1,6 +1,25 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from threading import Event
 
 from . import api_templates
+from .conftest import make_authed_client
+
+
+# cards are paged, an event may be past the first page
+def list_all_event_cards(client) -> list[dict]:
+    cards = []
+    cursor = None
+    while True:
+        req = api_templates.make_list_event_cards()
+        if cursor is not None:
+            req.params = {"cursor": cursor}
+        r = client.prepsend(req)
+        assert r.status_code == 200
+        cards.extend(r.json())
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return cards
 
 
 def test_event_cards_and_participation(admin_client, authed_client):
@@ -24,10 +43,10 @@ def test_event_cards_and_participation(admin_client, authed_client):
     event_id = r.json()["id"]
 
     # User sees card with NONE status
-    req = api_templates.make_list_event_cards()
-    r = authed_client.prepsend(req)
-    assert r.status_code == 200
-    cards = [c for c in r.json() if c["id"] == event_id]
+    cards = [
+        c for c in list_all_event_cards(authed_client)
+        if c["id"] == event_id
+    ]
     assert cards
     card = cards[0]
     assert card["participation_status"] == "NONE"
@@ -40,9 +59,10 @@ def test_event_cards_and_participation(admin_client, authed_client):
     r = authed_client.prepsend(req)
     assert r.status_code == 204
 
-    req = api_templates.make_list_event_cards()
-    r = authed_client.prepsend(req)
-    card = next(c for c in r.json() if c["id"] == event_id)
+    card = next(
+        c for c in list_all_event_cards(authed_client)
+        if c["id"] == event_id
+    )
     assert card["participation_status"] == "PARTICIPATING"
     assert card["participants_count"] == 1
 
@@ -53,9 +73,10 @@ def test_event_cards_and_participation(admin_client, authed_client):
     r = authed_client.prepsend(req)
     assert r.status_code == 204
 
-    req = api_templates.make_list_event_cards()
-    r = authed_client.prepsend(req)
-    card = next(c for c in r.json() if c["id"] == event_id)
+    card = next(
+        c for c in list_all_event_cards(authed_client)
+        if c["id"] == event_id
+    )
     assert card["participation_status"] == "REJECTED"
     assert card["participants_count"] == 0
 
@@ -66,9 +87,10 @@ def test_event_cards_and_participation(admin_client, authed_client):
     r = authed_client.prepsend(req)
     assert r.status_code == 204
 
-    req = api_templates.make_list_event_cards()
-    r = authed_client.prepsend(req)
-    card = next(c for c in r.json() if c["id"] == event_id)
+    card = next(
+        c for c in list_all_event_cards(authed_client)
+        if c["id"] == event_id
+    )
     assert card["participation_status"] == "NONE"
     assert card["participants_count"] == 0
 
@@ -81,6 +103,196 @@ def test_event_cards_and_participation(admin_client, authed_client):
     r = admin_client.prepsend(req)
     assert r.status_code == 200
 
+    cards = list_all_event_cards(authed_client)
+    assert all(c["id"] != event_id for c in cards)
+
+
+def test_event_cards_pagination_and_fields(admin_client, authed_client):
+    base = datetime.now(tz=timezone.utc) + timedelta(days=3650)
+    event_ids = []
+    for i in range(3):
+        starts_at = base + timedelta(minutes=i)
+        req = api_templates.make_create_event()
+        req.json = {
+            "name": f"Paged event {i}",
+            "description": "Full description",
+            "starts_at": starts_at.isoformat(),
+            "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+            "image_url": "https://example.com/image.png",
+            "participants_ids": [],
+        }
+        r = admin_client.prepsend(req)
+        assert r.status_code == 201
+        event_ids.append(r.json()["id"])
+
+    seen_ids = []
+    cursor = None
+    while True:
+        req = api_templates.make_list_event_cards()
+        req.params = {"limit": 2, "fields": "name"}
+        if cursor is not None:
+            req.params["cursor"] = cursor
+        r = authed_client.prepsend(req)
+        assert r.status_code == 200
+        cards = r.json()
+        assert len(cards) <= 2
+        assert all(set(c) == {"id", "name"} for c in cards)
+        seen_ids.extend(c["id"] for c in cards)
+        cursor = r.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen_ids) == len(set(seen_ids))
+    assert [i for i in seen_ids if i in event_ids] == event_ids
+
     req = api_templates.make_list_event_cards()
+    req.params = {"fields": "unknown"}
     r = authed_client.prepsend(req)
-    assert all(c["id"] != event_id for c in r.json())
+    assert r.status_code == 400
+
+    req = api_templates.make_list_event_cards()
+    req.params = {"cursor": "broken"}
+    r = authed_client.prepsend(req)
+    assert r.status_code == 400
+
+
+def test_event_capacity_counter(admin_client):
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": "Small event",
+        "description": "Full description",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+        "image_url": "https://example.com/image.png",
+        "max_participants_count": 1,
+        "participants_ids": [],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+    event_id = r.json()["id"]
+
+    first, second = make_authed_client(), make_authed_client()
+
+    req = api_templates.make_update_my_participation()
+    req.path_params = {"event_id": event_id}
+    req.json = {"status": "PARTICIPATING"}
+    assert first.prepsend(req).status_code == 204
+    # repeating own participation does not take another seat
+    assert first.prepsend(req).status_code == 204
+    assert second.prepsend(req).status_code == 400
+
+    req.json = {"status": "REJECTED"}
+    assert first.prepsend(req).status_code == 204
+
+    req.json = {"status": "PARTICIPATING"}
+    assert second.prepsend(req).status_code == 204
+
+    card = next(
+        c for c in list_all_event_cards(second)
+        if c["id"] == event_id
+    )
+    assert card["participants_count"] == 1
+    assert card["participation_status"] == "PARTICIPATING"
+
+
+def test_concurrent_joins_never_overbook(admin_client):
+    seats, joiners = 3, 12
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": "Hot event",
+        "description": "Full description",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+        "image_url": "https://example.com/image.png",
+        "max_participants_count": seats,
+        "participants_ids": [],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+    event_id = r.json()["id"]
+
+    clients = [make_authed_client() for _ in range(joiners)]
+
+    def join(client):
+        req = api_templates.make_update_my_participation()
+        req.path_params = {"event_id": event_id}
+        req.json = {"status": "PARTICIPATING"}
+        return client.prepsend(req).status_code
+
+    # every client also races with a duplicate of its own request
+    with ThreadPoolExecutor(max_workers=joiners * 2) as pool:
+        codes = list(pool.map(join, clients * 2))
+
+    assert set(codes) <= {204, 400}
+    card = next(
+        c for c in list_all_event_cards(clients[0])
+        if c["id"] == event_id
+    )
+    assert card["participants_count"] == seats
+
+
+def test_reconcile_during_joins_never_overbooks(admin_client):
+    seats, joiners = 4, 16
+    starts_at = datetime.now(tz=timezone.utc) + timedelta(hours=1)
+    req = api_templates.make_create_event()
+    req.json = {
+        "name": "Reconciled event",
+        "description": "Full description",
+        "starts_at": starts_at.isoformat(),
+        "ends_at": (starts_at + timedelta(hours=1)).isoformat(),
+        "image_url": "https://example.com/image.png",
+        "max_participants_count": seats,
+        "participants_ids": [],
+    }
+    r = admin_client.prepsend(req)
+    assert r.status_code == 201
+    event_id = r.json()["id"]
+
+    clients = [make_authed_client() for _ in range(joiners)]
+    admins = [make_authed_client(as_admin=True) for _ in range(4)]
+    joined = Event()
+
+    def join(client):
+        req = api_templates.make_update_my_participation()
+        req.path_params = {"event_id": event_id}
+        req.json = {"status": "PARTICIPATING"}
+        return client.prepsend(req).status_code
+
+    def reconcile(client):
+        codes = set()
+        while not joined.is_set():
+            # an overcounted event only turns joins down, while the
+            # reconcile fixing it must not lose a concurrent join
+            req = api_templates.make_drift_participants_count()
+            req.path_params = {"event_id": event_id}
+            req.json = {"delta": 1}
+            codes.add(client.prepsend(req).status_code)
+            req = api_templates.make_reconcile_participants_counts()
+            codes.add(client.prepsend(req).status_code)
+        return codes
+
+    with ThreadPoolExecutor(max_workers=joiners + len(admins)) as pool:
+        reconciles = [pool.submit(reconcile, i) for i in admins]
+        codes = list(pool.map(join, clients))
+        joined.set()
+        assert all(i.result() == {200, 204} for i in reconciles)
+    assert set(codes) <= {204, 400}
+
+    req = api_templates.make_list_event_participants()
+    req.path_params = {"event_id": event_id}
+    req.params = {"status": "PARTICIPATING"}
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    participants_count = len(r.json())
+    assert participants_count == codes.count(204)
+    assert participants_count <= seats
+
+    req = api_templates.make_reconcile_participants_counts()
+    r = admin_client.prepsend(req)
+    assert r.status_code == 200
+    req = api_templates.make_get_event()
+    req.path_params = {"event_id": event_id}
+    r = admin_client.prepsend(req)
+    assert r.json()["participants_count"] == participants_count
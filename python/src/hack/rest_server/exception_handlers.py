@@ -1,5 +1,22 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+
+from hack.core.errors.access import ErrorPasswordHashingOverloaded
+
+
+async def _handle_password_hashing_overloaded(
+        _request: Request,
+        exc: ErrorPasswordHashingOverloaded,
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service is overloaded, try later"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
 
 
 def register(app: FastAPI):
-    pass
+    app.add_exception_handler(
+        ErrorPasswordHashingOverloaded,
+        _handle_password_hashing_overloaded,
+    )
@@ -8,11 +8,14 @@ from hack.core.providers import (
     ProviderConfig,
     ProviderDatabase,
     ProviderRedis,
+    ProviderS3,
 )
 from hack.tasks.providers import ProviderBroker
+from hack.core.services.email_factory import EmailFactory
 from hack.core.services.providers import ProviderServices
 from hack.rest_server import (
     exception_handlers,
+    read_your_writes,
     routers,
 )
 from hack.rest_server.providers import ProviderServer
@@ -24,6 +27,7 @@ def main():
         ProviderDatabase(),
         ProviderBroker(),
         ProviderRedis(),
+        ProviderS3(),
         ProviderServices(),
         ProviderServer(),
     )
@@ -35,6 +39,7 @@ def main():
     setup_dishka(container, app)
 
     exception_handlers.register(app)
+    read_your_writes.register(app)
     app.include_router(routers.router)
 
     app.add_middleware(  # todo: adjust [sec]
@@ -45,6 +50,11 @@ def main():
         allow_headers=["*"],
     )
 
+    async def warm_up():
+        email_factory = await container.get(EmailFactory)
+        email_factory.warm_up()
+
+    app.add_event_handler("startup", warm_up)
     app.add_event_handler("shutdown", container.close)
 
     uvicorn.run(app, host="0.0.0.0", port=80)
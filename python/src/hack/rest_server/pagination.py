@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_LIMIT))
+
+
+def encode_cursor(*values: datetime | int) -> str:
+    """ Opaque keyset cursor pointing after the row with the given key """
+
+    raw = json.dumps([
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """ Decode a cursor made by `encode_cursor` from values of `types` """
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor))
+        if not isinstance(values, list):
+            raise ValueError("Cursor key does not match")
+        # a key of another length raises, a cursor of another sort is invalid
+        return tuple(
+            datetime.fromisoformat(value) if type_ is datetime
+            else type_(value)
+            for value, type_ in zip(values, types, strict=True)
+        )
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        ) from e
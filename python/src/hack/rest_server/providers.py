@@ -1,15 +1,14 @@
 import uuid
-from typing import AsyncGenerator, Any, NewType
 from uuid import UUID
 
-import aioboto3
 from dishka import Provider, Scope, from_context, provide
 from fastapi import FastAPI, HTTPException
 from fastapi.requests import Request
 from starlette.testclient import TestClient
 
-from hack.core.providers import ConfigS3
+from hack.core.providers import ReadFromPrimary
 from hack.core.services.access import AccessService
+from hack.core.services.read_your_writes import ReadYourWrites
 from hack.core.errors.access import ErrorUnauthorized
 from hack.rest_server.models import (
     AuthorizedUser,
@@ -17,9 +16,7 @@ from hack.rest_server.models import (
     AuthorizedAdministrator,
 )
 from hack.core.models.user import UserRoleEnum
-
-
-S3Client = NewType("S3Client", object)
+from hack.rest_server.read_your_writes import get_writer, set_writer
 
 
 class ProviderServer(Provider):
@@ -57,6 +54,7 @@ class ProviderServer(Provider):
                 detail="Invalid login session",
             ) from e
 
+        set_writer(request, login_session.uid)
         return CurrentLoginSession(login_session)
 
     @provide(scope=Scope.REQUEST)
@@ -87,22 +85,18 @@ class ProviderServer(Provider):
             )
         return AuthorizedAdministrator(authorized_user)
 
+    @provide(scope=Scope.REQUEST, override=True)
+    async def get_read_from_primary(
+            self,
+            request: Request,
+            read_your_writes: ReadYourWrites,
+    ) -> ReadFromPrimary:
+        writer = get_writer(request)
+        if writer is None:
+            return ReadFromPrimary(False)
+        return ReadFromPrimary(await read_your_writes.wrote_recently(writer))
+
     get_access_service = provide(
         AccessService,
         scope=Scope.REQUEST,
     )
-
-    @provide(scope=Scope.APP)
-    async def get_s3_client(
-            self,
-            config: ConfigS3,
-    ) -> AsyncGenerator[S3Client, None]:
-        session = aioboto3.Session()
-        async with session.client(
-                "s3",
-                endpoint_url=config.endpoint_url,
-                aws_access_key_id=config.access_key,
-                aws_secret_access_key=config.secret_key,
-                region_name=config.region_name,
-        ) as client:
-            yield client
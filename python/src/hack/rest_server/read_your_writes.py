@@ -0,0 +1,48 @@
+from uuid import UUID
+
+from fastapi import FastAPI, Request, Response
+
+from hack.core.services.read_your_writes import ReadYourWrites
+
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def get_writer(request: Request) -> str | None:
+    """
+    Login session the request claims to be made in, reads check it.
+
+    The header is not authenticated here, a foreign session uid only
+    sends the reads to the primary.  Writes are marked for the session
+    passed to `set_writer` instead.
+    """
+
+    login_session_uid = request.headers.get("X-Login-Session-Uid")
+    if login_session_uid is None:
+        return None
+    try:
+        return str(UUID(login_session_uid))
+    except ValueError:
+        return None
+
+
+def set_writer(request: Request, login_session_uid: UUID) -> None:
+    """ Track the writes of the request for the resolved login session """
+
+    request.state.writer = str(login_session_uid)
+
+
+async def _mark_writes(request: Request, call_next) -> Response:
+    response = await call_next(request)
+    # the handler has committed by now, so the mark follows the write
+    if request.method not in _READ_METHODS and response.status_code < 400:
+        # unauthenticated requests have no session to read the writes in
+        writer = getattr(request.state, "writer", None)
+        if writer is not None:
+            container = request.app.state.dishka_container
+            read_your_writes = await container.get(ReadYourWrites)
+            await read_your_writes.mark_write(writer)
+    return response
+
+
+def register(app: FastAPI):
+    app.middleware("http")(_mark_writes)
@@ -6,6 +6,7 @@ from . import (
     files,
     events,
     events_cards,
+    export_jobs,
     statistics,
     notifications,
     debug,
@@ -20,6 +21,7 @@ router.include_router(files.router, tags=["Userspace"])
 router.include_router(events_cards.router, tags=["Userspace"])
 router.include_router(events.userspace_router, tags=["Userspace"])
 router.include_router(events.admin_panel_router, tags=["Admin panel"])
+router.include_router(export_jobs.router, tags=["Admin panel"])
 router.include_router(statistics.userspace_router, tags=["Userspace"])
 router.include_router(statistics.admin_router, tags=["Admin panel"])
 router.include_router(notifications.router, tags=["Userspace"])
@@ -1,6 +1,6 @@
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
 from hack.core.models import IssuedRegistration, IssuedLoginRecovery, \
     RegistrationConfirmCodeEvent, RegistrationWelcomeEvent, \
@@ -21,6 +21,7 @@ from hack.core.services.notification import NotificationService
 from hack.core.services.uow_ctl import UoWCtl
 from hack.core.providers import ConfigHack
 from hack.rest_server.models import AuthorizedUser
+from hack.rest_server.read_your_writes import set_writer
 from hack.rest_server.schemas.access import (
     LoginCredentialsDTO,
     AuthorizationCredentialsDTO,
@@ -67,8 +68,6 @@ async def register(
             headers={"Retry-After": str(e.retry_after)},
         ) from e
 
-    await uow_ctl.commit()
-
     await notification_service.notify_about_event(
         RegistrationConfirmCodeEvent(
             full_name=payload.full_name,
@@ -76,6 +75,7 @@ async def register(
         ),
         recipients_emails=[payload.email],
     )
+    await uow_ctl.commit()
     return issued_registration
 
 
@@ -107,7 +107,6 @@ async def verify_registration(
             headers={"Retry-After": str(e.retry_after)},
         ) from e
 
-    await uow_ctl.commit()
     await notification_service.notify_about_event(
         RegistrationWelcomeEvent(
             full_name=user.full_name,
@@ -115,6 +114,7 @@ async def verify_registration(
         recipients_emails=[user.email],
         recipients_ids=[user.id],
     )
+    await uow_ctl.commit()
 
     return None
 
@@ -127,6 +127,7 @@ async def verify_registration(
 async def login(
         access_service: FromDishka[AccessService],
         uow_ctl: FromDishka[UoWCtl],
+        request: Request,
         payload: LoginCredentialsDTO,
 ) -> AuthorizationCredentialsDTO:
     try:
@@ -142,6 +143,7 @@ async def login(
         ) from e
 
     await uow_ctl.commit()
+    set_writer(request, login_session.uid)
     return AuthorizationCredentialsDTO(
         login_session_uid=login_session.uid,
         login_session_token=login_session.token,
@@ -171,8 +173,6 @@ async def issue_login_recovery(
             detail="User not found",
         ) from e
 
-    await uow_ctl.commit()
-
     recovery_url = config.templates.recovery_url_template.format(
         token=issued_recovery.token,
     )
@@ -183,6 +183,7 @@ async def issue_login_recovery(
         ),
         recipients_emails=[payload.email],
     )
+    await uow_ctl.commit()
     return issued_recovery
 
 
@@ -213,7 +214,6 @@ async def submit_login_recovery(
             detail="Invalid recovery token",
         ) from e
 
-    await uow_ctl.commit()
     await notification_service.notify_about_event(
         PasswordChangedEvent(
             full_name=user.full_name,
@@ -221,6 +221,7 @@ async def submit_login_recovery(
         recipients_emails=[user.email],
         recipients_ids=[user.id],
     )
+    await uow_ctl.commit()
     return None
 
 
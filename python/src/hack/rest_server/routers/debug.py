@@ -1,21 +1,52 @@
+import random
 from datetime import datetime, timedelta, timezone
+from uuid import uuid4
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
 from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select, delete
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Executable, delete, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from hack.core.models import IssuedRegistration, IssuedLoginRecovery, User, \
-    Event
-from hack.core.providers import ConfigHack
+    Event, EventParticipant, InstantNotification
+from hack.core.models.user import UserRoleEnum
+from hack.core.providers import ConfigHack, ReplicaEngine
 from hack.core.services.access import AccessService
+from hack.core.services.email_factory import EmailFactory
+from hack.core.services.event_participants import EventParticipantsService
+from hack.core.services.login_session_cache import LoginSessionCache
+from hack.core.services.outbox import OutboxRelayMetrics
+from hack.core.services.password_hashing import PasswordHashingExecutor
+from hack.core.services.query_plans import QueryPlansService
+from hack.core.services.statistics import build_user_participations_query
+from hack.core.services.statistics_cache import StatisticsCache
+from hack.core.services.statistics_counters import StatisticsCountersService
 from hack.core.services.uow_ctl import UoWCtl
+from hack.rest_server.pagination import DEFAULT_PAGE_LIMIT
+from hack.rest_server.routers.events import (
+    build_event_participants_query,
+    build_events_query,
+)
+from hack.rest_server.routers.events_cards import (
+    DEFAULT_CARD_FIELDS,
+    build_event_cards_query,
+)
+from hack.rest_server.routers.notifications import (
+    build_instant_notifications_query,
+)
 from hack.rest_server.schemas.debug import (
     InterceptVerificationCodeDTO,
     InterceptRecoveryTokenDTO,
     ChangeUserRoleDTO,
+    DriftParticipantsCountDTO,
     ExpireVerificationCodeDTO,
+    SeedExamplesDTO,
+)
+from hack.rest_server.schemas.events import EventsSortEnum, SortOrderEnum
+from hack.tasks.tasks.event_reminders import (
+    REMINDER_CHUNK_SIZE,
+    build_reminders_claim,
 )
 
 router = APIRouter(
@@ -122,14 +153,30 @@ async def expire_verification_code(
 async def delete_examples(
         session: FromDishka[AsyncSession],
         uow: FromDishka[UoWCtl],
+        login_session_cache: FromDishka[LoginSessionCache],
+        event_participants_service: FromDishka[EventParticipantsService],
+        statistics_counters_service: FromDishka[StatisticsCountersService],
+        statistics_cache: FromDishka[StatisticsCache],
 ) -> None:
     stmt = (delete(User)
-            .where(User.email.endswith("@example.com")))
-    await session.execute(stmt)
-    stmt = (delete(Event)
-            .where(Event.image_url.startswith("https://example.com/")))
-    await session.execute(stmt)
+            .where(User.email.endswith("@example.com"))
+            .returning(User.id))
+    deleted_user_ids = list(await session.scalars(stmt))
+    example_events = Event.image_url.startswith("https://example.com/")
+    stmt = (select(EventParticipant.user_id)
+            .join(Event, Event.id == EventParticipant.event_id)
+            .where(example_events))
+    affected_user_ids = list(await session.scalars(stmt))
+    await session.execute(delete(Event).where(example_events))
+    # participations of deleted users are removed by the fk cascade
+    await event_participants_service.reconcile()
+    # bulk deletes bypass the counters maintained on write
+    await statistics_counters_service.rebuild()
     await uow.commit()
+    for user_id in deleted_user_ids:
+        await login_session_cache.invalidate_user(user_id)
+    statistics_cache.invalidate_events_counts()
+    await statistics_cache.invalidate_users(affected_user_ids)
 
 
 @router.post(
@@ -140,6 +187,7 @@ async def delete_examples(
 async def change_user_role(
         session: FromDishka[AsyncSession],
         uow_ctl: FromDishka[UoWCtl],
+        login_session_cache: FromDishka[LoginSessionCache],
         config: FromDishka[ConfigHack],
         payload: ChangeUserRoleDTO,
 ) -> None:
@@ -158,4 +206,285 @@ async def change_user_role(
     user.role = payload.role
     await session.flush()
     await uow_ctl.commit()
+    await login_session_cache.invalidate_user(user.id)
+    return None
+
+
+@router.post(
+    "/events/{event_id}/drift-participants-count",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+@inject
+async def drift_participants_count(
+        session: FromDishka[AsyncSession],
+        uow_ctl: FromDishka[UoWCtl],
+        config: FromDishka[ConfigHack],
+        event_id: int,
+        payload: DriftParticipantsCountDTO,
+) -> None:
+    """ Shift the counter away from the participants, for reconcile tests """
+
+    if not config.debug:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    await session.execute(
+        update(Event)
+        .where(Event.id == event_id)
+        .values(participants_count=Event.participants_count + payload.delta)
+    )
+    await uow_ctl.commit()
+    return None
+
+
+@router.post(
+    "/participants-counts/reconcile",
+)
+@inject
+async def reconcile_participants_counts(
+        event_participants_service: FromDishka[EventParticipantsService],
+        uow_ctl: FromDishka[UoWCtl],
+        config: FromDishka[ConfigHack],
+) -> list[int]:
+    if not config.debug:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    fixed_event_ids = await event_participants_service.reconcile()
+    await uow_ctl.commit()
+    return fixed_event_ids
+
+
+@router.get(
+    "/statistics-counters/check",
+)
+@inject
+async def check_statistics_counters(
+        statistics_counters_service: FromDishka[StatisticsCountersService],
+        config: FromDishka[ConfigHack],
+) -> list[str]:
+    if not config.debug:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    return await statistics_counters_service.check()
+
+
+def _hot_queries(
+        now: datetime,
+        user_id: int,
+        event_id: int,
+) -> dict[str, Executable]:
+    """ Statements of the frequent requests, built by their handlers """
+
+    return {
+        "event_cards": build_event_cards_query(
+            list(DEFAULT_CARD_FIELDS),
+            user_id=user_id,
+            status_filter=None,
+            after=None,
+            limit=DEFAULT_PAGE_LIMIT,
+            now=now,
+        ),
+        "admin_events_by_start": build_events_query(
+            status_filter=None,
+            name=None,
+            starts_after=None,
+            starts_before=None,
+            sort=EventsSortEnum.STARTS_AT,
+            order=SortOrderEnum.ASC,
+            include_participants=False,
+            after=None,
+            limit=DEFAULT_PAGE_LIMIT,
+            now=now,
+        ),
+        "event_participants": build_event_participants_query(
+            event_id,
+            status_filter=(
+                EventParticipant.ParticipationStatusEnum.PARTICIPATING
+            ),
+            after_id=None,
+            limit=DEFAULT_PAGE_LIMIT,
+        ),
+        "user_participations": build_user_participations_query(
+            user_id,
+            now,
+        ),
+        "pending_reminders": build_reminders_claim(
+            now,
+            now + timedelta(hours=24),
+            REMINDER_CHUNK_SIZE,
+        ),
+        "unread_notifications": build_instant_notifications_query(
+            user_id,
+            include_acked=False,
+            limit=50,
+            offset=0,
+        ),
+        "all_notifications": build_instant_notifications_query(
+            user_id,
+            include_acked=True,
+            limit=50,
+            offset=0,
+        ),
+    }
+
+
+@router.get(
+    "/query-plans",
+)
+@inject
+async def get_query_plans(
+        query_plans_service: FromDishka[QueryPlansService],
+        config: FromDishka[ConfigHack],
+        user_id: int,
+        event_id: int,
+) -> dict[str, list[str]]:
+    if not config.debug:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    now = datetime.now(tz=timezone.utc)
+    return await query_plans_service.explain(
+        _hot_queries(now, user_id, event_id),
+    )
+
+
+@router.post(
+    "/seed-examples",
+    status_code=status.HTTP_204_NO_CONTENT,
+)
+@inject
+async def seed_examples(
+        session: FromDishka[AsyncSession],
+        uow_ctl: FromDishka[UoWCtl],
+        event_participants_service: FromDishka[EventParticipantsService],
+        statistics_counters_service: FromDishka[StatisticsCountersService],
+        statistics_cache: FromDishka[StatisticsCache],
+        config: FromDishka[ConfigHack],
+        payload: SeedExamplesDTO,
+) -> None:
+    """
+    Fill the tables with example data, removed by `delete_examples`.
+
+    Plans of the frequent queries depend on the table statistics, so
+    they are checked against a dataset of a realistic size.
+    """
+
+    if not config.debug:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    now = datetime.now(tz=timezone.utc)
+    prefix = f"seed-{uuid4().hex[:8]}"
+    user_ids = list(await session.scalars(
+        insert(User).returning(User.id),
+        [
+            {
+                "role": UserRoleEnum.USER,
+                "username": f"{prefix}-{i}",
+                "email": f"{prefix}-{i}@example.com",
+                "full_name": f"Example user {i}",
+                # no password matches it, the users can not log in
+                "password_hash": "!",
+                "created_at": now,
+            }
+            for i in range(payload.users)
+        ],
+    ))
+
+    # events are spread evenly over the last year and the next month,
+    # most of them are history like on a running instance; a few are
+    # rejected
+    first_starts_at = now - timedelta(days=335)
+    step = timedelta(days=365) / payload.events
+    event_rows = [
+        {
+            "name": f"Example event {i}",
+            "description": "Example event",
+            "starts_at": first_starts_at + step * i,
+            "ends_at": first_starts_at + step * i + timedelta(hours=2),
+            "image_url": f"https://example.com/{prefix}-{i}.png",
+            "rejected_at": now if i % 20 == 0 else None,
+            "created_at": now,
+        }
+        for i in range(payload.events)
+    ]
+    event_ids = await session.scalars(
+        insert(Event).returning(Event.id, sort_by_parameter_order=True),
+        event_rows,
+    )
+    # reminders of started events have been sent
+    events = [
+        (event_id, row["starts_at"] < now)
+        for event_id, row in zip(event_ids, event_rows, strict=True)
+    ]
+
+    participations_per_user = min(
+        payload.participations_per_user,
+        len(events),
+    )
+    participating = EventParticipant.ParticipationStatusEnum.PARTICIPATING
+    participants = []
+    for user_id in user_ids:
+        for event_id, started in random.sample(
+                events,
+                participations_per_user,
+        ):
+            participants.append({
+                "status": participating,
+                "event_id": event_id,
+                "user_id": user_id,
+                "reminder_queued_at": now if started else None,
+                "created_at": now,
+            })
+    if participants:
+        await session.execute(insert(EventParticipant), participants)
+
+    notifications = [
+        {
+            "recipient_id": user_id,
+            "title": "Example notification",
+            "content": "Example notification",
+            "acked_at": now if i % 2 else None,
+            "created_at": now - timedelta(minutes=i),
+        }
+        for user_id in user_ids
+        for i in range(payload.notifications_per_user)
+    ]
+    if notifications:
+        await session.execute(insert(InstantNotification), notifications)
+
+    await event_participants_service.reconcile()
+    await statistics_counters_service.rebuild()
+    # the planner would not see the new rows until autovacuum analyzes them
+    for table in (User, Event, EventParticipant, InstantNotification):
+        await session.execute(text(f'ANALYZE "{table.__tablename__}"'))
+    await uow_ctl.commit()
+    statistics_cache.invalidate_events_counts()
     return None
+
+
+@router.get(
+    "/metrics",
+)
+@inject
+async def get_metrics(
+        login_session_cache: FromDishka[LoginSessionCache],
+        password_hashing: FromDishka[PasswordHashingExecutor],
+        email_factory: FromDishka[EmailFactory],
+        statistics_cache: FromDishka[StatisticsCache],
+        outbox_relay_metrics: FromDishka[OutboxRelayMetrics],
+        engine: FromDishka[AsyncEngine],
+        replica_engine: FromDishka[ReplicaEngine],
+        config: FromDishka[ConfigHack],
+) -> dict[str, dict[str, float]]:
+    if not config.debug:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    metrics = {
+        "login_session_cache": login_session_cache.stats(),
+        "password_hashing": password_hashing.stats(),
+        "email_render_cache": email_factory.stats(),
+        "statistics_cache": statistics_cache.stats(),
+        "outbox_relay": await outbox_relay_metrics.stats(),
+        "database_pool": engine.pool.stats(),
+    }
+    if replica_engine is not engine:
+        metrics["database_replica_pool"] = replica_engine.pool.stats()
+    return metrics
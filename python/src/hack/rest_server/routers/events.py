@@ -1,15 +1,15 @@
-import csv
-import io
+import asyncio
 from datetime import datetime, timezone
+from typing import IO
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from fastapi.responses import StreamingResponse
-from openpyxl import Workbook
-from sqlalchemy import func, select
+from sqlalchemy import Select, delete, func, insert, select, tuple_, \
+    update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import InstrumentedAttribute, selectinload
 
 from hack.core.models import (
     Event,
@@ -21,12 +21,33 @@ from hack.core.models import (
     User,
 )
 from hack.core.models.user import UserRoleEnum
-from hack.core.models.event import EventStatusEnum
+from hack.core.models.event import EventStatusEnum, compute_event_status
+from hack.core.providers import ReadOnlySession
+from hack.core.services.event_participants import EventParticipantsService
+from hack.core.services.statistics_cache import StatisticsCache
+from hack.core.services.statistics_counters import (
+    EventCounters,
+    StatisticsCountersService,
+)
+from hack.core.services.participants_export import (
+    EXPORT_MEDIA_TYPES,
+    ParticipantsExportService,
+)
 from hack.core.services.uow_ctl import UoWCtl
 from hack.core.services.notification import NotificationService
 from hack.rest_server.models import AuthorizedAdministrator, AuthorizedUser
+from hack.rest_server.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+)
 from hack.rest_server.schemas.events import (
     EventDTO,
+    EventParticipantDTO,
+    EventsSortEnum,
+    SortOrderEnum,
     CreateEventDTO,
     UpdateEventDTO,
     UpdateMyParticipationDTO,
@@ -70,11 +91,11 @@ def _validate_event_dates(
 
 def _validate_participants_limit(
     max_participants_count: int | None,
-    participant_ids: list[int],
+    participants_count: int,
 ) -> None:
     if (
         max_participants_count is not None
-        and len(participant_ids) > max_participants_count
+        and participants_count > max_participants_count
     ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -115,6 +136,8 @@ async def create_event(
     uow_ctl: FromDishka[UoWCtl],
     authorized_administrator: FromDishka[AuthorizedAdministrator],
     notification_service: FromDishka[NotificationService],
+    statistics_counters_service: FromDishka[StatisticsCountersService],
+    statistics_cache: FromDishka[StatisticsCache],
     payload: CreateEventDTO,
 ) -> Event:
     participant_ids = list(dict.fromkeys(payload.participants_ids))
@@ -128,7 +151,7 @@ async def create_event(
     )
     _validate_participants_limit(
         payload.max_participants_count,
-        participant_ids,
+        len(participant_ids),
     )
     await _ensure_users_exist(session, participant_ids)
 
@@ -143,6 +166,7 @@ async def create_event(
         max_participants_count=payload.max_participants_count,
         location=payload.location,
         rejected_at=None,
+        participants_count=len(participant_ids),
     )
     session.add(event)
     event.participants = [
@@ -153,6 +177,11 @@ async def create_event(
         for user_id in participant_ids
     ]
     await session.flush()
+    await statistics_counters_service.track_event(
+        None,
+        EventCounters.of(event),
+    )
+    await statistics_counters_service.track_participants(participant_ids, 1)
     if participant_ids:
         await notification_service.notify_about_event(
             EventCreatedNotification(
@@ -165,27 +194,45 @@ async def create_event(
             recipients_ids=participant_ids,
         )
     await uow_ctl.commit()
+    statistics_cache.invalidate_events_counts()
+    await statistics_cache.invalidate_users(participant_ids)
     return event
 
 
-@admin_panel_router.get(
-    "",
-    response_model=list[EventDTO],
-)
-@inject
-async def list_events(
-    session: FromDishka[AsyncSession],
-    authorized_administrator: FromDishka[AuthorizedAdministrator],
-    status_filter: EventStatusEnum | None = Query(
-        default=None,
-        alias="status",
-    ),
-) -> list[Event]:
-    now = datetime.now(tz=timezone.utc)
+def _events_keyset(
+        sort: EventsSortEnum,
+) -> tuple[tuple[InstrumentedAttribute, ...], tuple[type, ...]]:
+    if sort is EventsSortEnum.STARTS_AT:
+        return (Event.starts_at, Event.id), (datetime, int)
+    return (Event.id,), (int,)
+
+
+def build_events_query(
+        status_filter: EventStatusEnum | None,
+        name: str | None,
+        starts_after: datetime | None,
+        starts_before: datetime | None,
+        sort: EventsSortEnum,
+        order: SortOrderEnum,
+        include_participants: bool,
+        after: tuple | None,
+        limit: int,
+        now: datetime,
+) -> Select:
+    """ Page of events for the admin panel, `after` is a decoded cursor """
+
+    keyset, _ = _events_keyset(sort)
+    descending = order is SortOrderEnum.DESC
+
+    if include_participants:
+        stmt = select(Event).options(selectinload(Event.participants))
+    else:
+        # plain columns: no entities, no participants
+        stmt = select(Event.__table__)
     stmt = (
-        select(Event)
-        .order_by(Event.id)
-        .options(selectinload(Event.participants))
+        stmt
+        .order_by(*(i.desc() if descending else i for i in keyset))
+        .limit(limit + 1)
     )
 
     if status_filter == EventStatusEnum.REJECTED:
@@ -200,9 +247,83 @@ async def list_events(
             Event.rejected_at.is_(None),
             Event.ends_at > now,
         )
+    if name:
+        stmt = stmt.where(Event.name.icontains(name, autoescape=True))
+    if starts_after is not None:
+        stmt = stmt.where(Event.starts_at >= starts_after)
+    if starts_before is not None:
+        stmt = stmt.where(Event.starts_at < starts_before)
+    if after is not None:
+        key = tuple_(*keyset)
+        stmt = stmt.where(key < after if descending else key > after)
+    return stmt
 
-    events = await session.scalars(stmt)
-    return list(events.unique())
+
+@admin_panel_router.get(
+    "",
+    response_model=list[EventDTO],
+)
+@inject
+async def list_events(
+    session: FromDishka[ReadOnlySession],
+    authorized_administrator: FromDishka[AuthorizedAdministrator],
+    response: Response,
+    status_filter: EventStatusEnum | None = Query(
+        default=None,
+        alias="status",
+    ),
+    name: str | None = Query(
+        default=None,
+        description="Case insensitive part of the event name",
+    ),
+    starts_after: datetime | None = Query(default=None),
+    starts_before: datetime | None = Query(default=None),
+    sort: EventsSortEnum = Query(default=EventsSortEnum.ID),
+    order: SortOrderEnum = Query(default=SortOrderEnum.ASC),
+    include_participants: bool = Query(
+        default=True,
+        description="When false, only `participants_count` is returned",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_LIMIT),
+    cursor: str | None = Query(default=None),
+) -> list[Event] | list[EventDTO]:
+    limit = clamp_limit(limit)
+    keyset, keyset_types = _events_keyset(sort)
+    after = None
+    if cursor is not None:
+        after = decode_cursor(cursor, *keyset_types)
+    stmt = build_events_query(
+        status_filter=status_filter,
+        name=name,
+        starts_after=starts_after,
+        starts_before=starts_before,
+        sort=sort,
+        order=order,
+        include_participants=include_participants,
+        after=after,
+        limit=limit,
+        now=datetime.now(tz=timezone.utc),
+    )
+
+    if include_participants:
+        rows = list(await session.scalars(stmt))
+    else:
+        rows = list(await session.execute(stmt))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            *(getattr(rows[-1], i.key) for i in keyset),
+        )
+
+    if include_participants:
+        return rows
+    return [
+        EventDTO(
+            **row._mapping,
+            status=compute_event_status(row.ends_at, row.rejected_at),
+        )
+        for row in rows
+    ]
 
 
 @admin_panel_router.get(
@@ -230,6 +351,69 @@ async def get_event(
     return event
 
 
+def build_event_participants_query(
+        event_id: int,
+        status_filter: EventParticipant.ParticipationStatusEnum | None,
+        after_id: int | None,
+        limit: int,
+) -> Select:
+    stmt = (
+        select(EventParticipant)
+        .where(EventParticipant.event_id == event_id)
+        .order_by(EventParticipant.id)
+        .limit(limit + 1)
+    )
+    if status_filter is not None:
+        stmt = stmt.where(EventParticipant.status == status_filter)
+    if after_id is not None:
+        stmt = stmt.where(EventParticipant.id > after_id)
+    return stmt
+
+
+@admin_panel_router.get(
+    "/{event_id}/participants",
+    response_model=list[EventParticipantDTO],
+)
+@inject
+async def list_event_participants(
+    session: FromDishka[ReadOnlySession],
+    authorized_administrator: FromDishka[AuthorizedAdministrator],
+    response: Response,
+    event_id: int,
+    status_filter: EventParticipant.ParticipationStatusEnum | None = Query(
+        default=None,
+        alias="status",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_LIMIT),
+    cursor: str | None = Query(default=None),
+) -> list[EventParticipant]:
+    limit = clamp_limit(limit)
+    event = await session.get(Event, event_id)
+    if event is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found",
+        )
+
+    after_id = None
+    if cursor is not None:
+        (after_id,) = decode_cursor(cursor, int)
+    stmt = build_event_participants_query(
+        event_id,
+        status_filter=status_filter,
+        after_id=after_id,
+        limit=limit,
+    )
+
+    participants = list(await session.scalars(stmt))
+    if len(participants) > limit:
+        participants = participants[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            participants[-1].id,
+        )
+    return participants
+
+
 @admin_panel_router.put(
     "/{event_id}",
     response_model=EventDTO,
@@ -240,21 +424,21 @@ async def update_event(
     uow_ctl: FromDishka[UoWCtl],
     authorized_administrator: FromDishka[AuthorizedAdministrator],
     notification_service: FromDishka[NotificationService],
+    event_participants_service: FromDishka[EventParticipantsService],
+    statistics_counters_service: FromDishka[StatisticsCountersService],
+    statistics_cache: FromDishka[StatisticsCache],
     event_id: int,
     payload: UpdateEventDTO,
 ) -> Event:
-    stmt = (
-        select(Event)
-        .where(Event.id == event_id)
-        .options(selectinload(Event.participants))
-    )
-    event = await session.scalar(stmt)
+    # locked, so the statistics roll-over can not flip it meanwhile
+    event = await session.get(Event, event_id, with_for_update=True)
 
     if event is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found",
         )
+    counters_before = EventCounters.of(event)
 
     update_data = payload.model_dump(exclude_unset=True)
     raw_starts_at = update_data.get("starts_at", event.starts_at)
@@ -308,6 +492,7 @@ async def update_event(
         event.location = payload.location  # type: ignore[assignment]
     event.starts_at = starts_at
     event.ends_at = ends_at
+    event.statistics_past = ends_at <= datetime.now(tz=timezone.utc)
 
     if "rejected_at" in update_data:
         event.rejected_at = _normalize_datetime(payload.rejected_at) if payload.rejected_at else None  # type: ignore[arg-type]
@@ -325,45 +510,70 @@ async def update_event(
         else event.max_participants_count
     )
 
+    added_ids: list[int] = []
+    removed_ids: list[int] = []
     if participant_ids is not None:
         _validate_participants_limit(
             max_participants_count,
-            participant_ids,
+            len(participant_ids),
         )
         await _ensure_users_exist(session, participant_ids)
-        event.participants.clear()
-        await session.flush()
-        event.participants = [
-            EventParticipant(
-                user_id=user_id,
-                status=EventParticipant.ParticipationStatusEnum.PARTICIPATING,
-            )
-            for user_id in participant_ids
-        ]
+        added_ids, removed_ids = await _sync_participants(
+            session,
+            event,
+            participant_ids,
+        )
+        await event_participants_service.recount(event)
     else:
-        current_ids = [p.user_id for p in event.participants]
         _validate_participants_limit(
             max_participants_count,
-            current_ids,
+            event.participants_count,
         )
 
     await session.flush()
-    participant_user_ids = [
-        p.user_id for p in event.participants
-        if p.status == EventParticipant.ParticipationStatusEnum.PARTICIPATING
-    ]
-    if participant_user_ids:
+    counters_after = EventCounters.of(event)
+    await statistics_counters_service.track_event(
+        counters_before,
+        counters_after,
+    )
+    await statistics_counters_service.track_roster(
+        event.id,
+        counters_before,
+        counters_after,
+        added_ids=added_ids,
+        removed_ids=removed_ids,
+    )
+    details_changed = bool(update_data.keys() - {"participants_ids"})
+    if details_changed:
+        recipients_ids = list(await session.scalars(
+            select(EventParticipant.user_id)
+            .where(EventParticipant.event_id == event.id)
+            .where(
+                EventParticipant.status
+                == EventParticipant.ParticipationStatusEnum.PARTICIPATING
+            )
+        ))
+    else:
+        # only the roster changed: tell just the newly added participants
+        recipients_ids = added_ids
+    if recipients_ids:
         await notification_service.notify_about_event(
             EventUpdatedNotification(
                 event_name=event.name,
                 starts_at=event.starts_at,
                 location=event.location,
                 event_id=event.id,
-                participants_count=len(participant_user_ids),
+                participants_count=event.participants_count,
             ),
-            recipients_ids=participant_user_ids,
+            recipients_ids=recipients_ids,
         )
+    # bulk statements bypass the relationship, load it for the response
+    await session.refresh(event, attribute_names=["participants"])
     await uow_ctl.commit()
+    statistics_cache.invalidate_events_counts()
+    await statistics_cache.invalidate_users(
+        set(recipients_ids) | set(added_ids) | set(removed_ids),
+    )
     return event
 
 
@@ -377,34 +587,46 @@ async def update_my_participation(
     uow_ctl: FromDishka[UoWCtl],
     authorized_user: FromDishka[AuthorizedUser],
     notification_service: FromDishka[NotificationService],
+    event_participants_service: FromDishka[EventParticipantsService],
+    statistics_counters_service: FromDishka[StatisticsCountersService],
+    statistics_cache: FromDishka[StatisticsCache],
     event_id: int,
     payload: UpdateMyParticipationDTO,
 ) -> None:
-    stmt_event = (select(Event)
-                  .where(Event.id == event_id)
-                  .options(selectinload(Event.participants)))
-    event = await session.scalar(stmt_event)
+    event = await session.get(Event, event_id)
     if event is None or event.rejected_at is not None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event not found",
         )
+    counters = EventCounters.of(event)
 
+    # serializes concurrent requests of the same user to the same event
+    # only, so the participant row is read and written without a race
+    await session.execute(
+        select(func.pg_advisory_xact_lock(event_id, authorized_user.id))
+    )
     participant = await session.scalar(
         select(EventParticipant)
         .where(EventParticipant.event_id == event_id)
         .where(EventParticipant.user_id == authorized_user.id)
     )
     original_status = participant.status if participant else None
+    was_participating = original_status == (
+        EventParticipant.ParticipationStatusEnum.PARTICIPATING
+    )
 
     if payload.status == ParticipationStatusEnum.NONE:
         if participant is not None:
             await session.delete(participant)
         await session.flush()
-        send_cancel = original_status == (
-            EventParticipant.ParticipationStatusEnum.PARTICIPATING
-        )
-        if send_cancel:
+        if was_participating:
+            await event_participants_service.release_seat(event)
+            await statistics_counters_service.track_participation(
+                counters,
+                authorized_user.id,
+                delta=-1,
+            )
             await _notify_participation_cancelled(
                 session,
                 notification_service,
@@ -412,6 +634,7 @@ async def update_my_participation(
                 authorized_user.full_name,
             )
         await uow_ctl.commit()
+        await statistics_cache.invalidate_users([authorized_user.id])
         return None
 
     if payload.status is ParticipationStatusEnum.PARTICIPATING:
@@ -422,21 +645,13 @@ async def update_my_participation(
                 detail="Event already finished",
             )
 
-    if payload.status is ParticipationStatusEnum.PARTICIPATING:
-        stmt_count = (
-            select(func.count(EventParticipant.id))
-            .where(EventParticipant.event_id == event_id)
-            .where(
-                EventParticipant.status
-                == EventParticipant.ParticipationStatusEnum.PARTICIPATING
-            )
-            .where(EventParticipant.user_id != authorized_user.id)
-        )
-        current_count = await session.scalar(stmt_count) or 0
-        if (
-            event.max_participants_count is not None
-            and current_count + 1 > event.max_participants_count
-        ):
+    if (
+            payload.status is ParticipationStatusEnum.PARTICIPATING
+            and not was_participating
+    ):
+        # conditional increment: the capacity check can not race
+        reserved = await event_participants_service.reserve_seat(event)
+        if not reserved:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Max participants count exceeded",
@@ -459,7 +674,18 @@ async def update_my_participation(
         participant.status = target_status
 
     await session.flush()
-    if target_status == EventParticipant.ParticipationStatusEnum.PARTICIPATING:
+    is_participating = (
+        target_status == EventParticipant.ParticipationStatusEnum.PARTICIPATING
+    )
+    if was_participating and not is_participating:
+        await event_participants_service.release_seat(event)
+    if was_participating != is_participating:
+        await statistics_counters_service.track_participation(
+            counters,
+            authorized_user.id,
+            delta=1 if is_participating else -1,
+        )
+    if is_participating:
         await _notify_participation_confirmed(
             session,
             notification_service,
@@ -477,9 +703,70 @@ async def update_my_participation(
             authorized_user.full_name,
         )
     await uow_ctl.commit()
+    await statistics_cache.invalidate_users([authorized_user.id])
     return None
 
 
+async def _sync_participants(
+        session: AsyncSession,
+        event: Event,
+        participant_ids: list[int],
+) -> tuple[list[int], list[int]]:
+    """
+    Make `participant_ids` the participating roster of the event.
+
+    Only the difference is written, so kept rows preserve `created_at`
+    and `reminder_queued_at`.  Returns ids that became participating
+    and ids that stopped participating.
+    """
+
+    participating = EventParticipant.ParticipationStatusEnum.PARTICIPATING
+    existing = dict((await session.execute(
+        select(EventParticipant.user_id, EventParticipant.status)
+        .where(EventParticipant.event_id == event.id)
+    )).all())
+    desired = set(participant_ids)
+
+    removed_ids = existing.keys() - desired
+    inserted_ids = [i for i in participant_ids if i not in existing]
+    reactivated_ids = [
+        i for i in participant_ids
+        if i in existing and existing[i] != participating
+    ]
+
+    if removed_ids:
+        await session.execute(
+            delete(EventParticipant)
+            .where(EventParticipant.event_id == event.id)
+            .where(EventParticipant.user_id.in_(list(removed_ids)))
+            .execution_options(synchronize_session=False)
+        )
+    if reactivated_ids:
+        await session.execute(
+            update(EventParticipant)
+            .where(EventParticipant.event_id == event.id)
+            .where(EventParticipant.user_id.in_(reactivated_ids))
+            .values(status=participating)
+            .execution_options(synchronize_session=False)
+        )
+    if inserted_ids:
+        await session.execute(
+            insert(EventParticipant),
+            [
+                {
+                    "event_id": event.id,
+                    "user_id": user_id,
+                    "status": participating,
+                }
+                for user_id in inserted_ids
+            ],
+        )
+    return (
+        [*inserted_ids, *reactivated_ids],
+        [i for i in removed_ids if existing[i] == participating],
+    )
+
+
 async def _load_admin_ids(session: AsyncSession) -> list[int]:
     stmt = (
         select(User.id)
@@ -504,7 +791,7 @@ async def _notify_participation_confirmed(
             starts_at=event.starts_at,
             location=event.location,
             event_id=event.id,
-            participants_count=_count_participating(event),
+            participants_count=event.participants_count,
             participant_name=participant_name or "Участник",
         ),
         recipients_ids=admin_ids,
@@ -526,40 +813,19 @@ async def _notify_participation_cancelled(
             starts_at=event.starts_at,
             location=event.location,
             event_id=event.id,
-            participants_count=_count_participating(event),
+            participants_count=event.participants_count,
             participant_name=participant_name or "Участник",
         ),
         recipients_ids=admin_ids,
     )
 
 
-def _count_participating(event: Event) -> int:
-    return sum(
-        1
-        for p in event.participants
-        if p.status == EventParticipant.ParticipationStatusEnum.PARTICIPATING
-    )
-
-
-def _render_csv(headers: list[str], rows: list[list[str]]) -> bytes:
-    buffer = io.StringIO(newline="")
-    writer = csv.writer(buffer)
-    writer.writerow(headers)
-    writer.writerows(rows)
-    return buffer.getvalue().encode("utf-8")
-
-
-def _render_xlsx(headers: list[str], rows: list[list[str]]) -> bytes:
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Participants"
-    ws.append(headers)
-    for row in rows:
-        ws.append(row)
-    buffer = io.BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    return buffer.read()
+async def _iter_file(fileobj: IO[bytes], chunk_size: int = 64 * 1024):
+    try:
+        while chunk := await asyncio.to_thread(fileobj.read, chunk_size):
+            yield chunk
+    finally:
+        fileobj.close()
 
 
 @admin_panel_router.get(
@@ -569,6 +835,7 @@ def _render_xlsx(headers: list[str], rows: list[list[str]]) -> bytes:
 async def export_event_participants(
     session: FromDishka[AsyncSession],
     authorized_administrator: FromDishka[AuthorizedAdministrator],
+    participants_export_service: FromDishka[ParticipantsExportService],
     event_id: int,
     fmt: str = Query(default="csv", alias="format"),
 ) -> StreamingResponse:
@@ -586,62 +853,16 @@ async def export_event_participants(
             detail="Event not found",
         )
 
-    participants_stmt = (
-        select(
-            EventParticipant.user_id,
-            User.email,
-            User.full_name,
-            EventParticipant.status,
-            EventParticipant.created_at.label("joined_at"),
-        )
-        .join(User, User.id == EventParticipant.user_id)
-        .where(EventParticipant.event_id == event_id)
-        .where(
-            EventParticipant.status
-            == EventParticipant.ParticipationStatusEnum.PARTICIPATING
-        )
-        .order_by(EventParticipant.created_at, EventParticipant.id)
-    )
-    participant_rows = list(await session.execute(participants_stmt))
-
-    headers = [
-        "user_id",
-        "email",
-        "full_name",
-        "status",
-        "joined_at",
-        "event_id",
-        "event_name",
-    ]
-    rows: list[list[str]] = []
-    for row in participant_rows:
-        joined_at = getattr(row, "joined_at", None)
-        rows.append(
-            [
-                str(row.user_id),
-                row.email,
-                row.full_name,
-                row.status.value if hasattr(row, "status") else str(row.status),
-                joined_at.isoformat() if joined_at else "",
-                str(event.id),
-                event.name,
-            ]
-        )
-
     if fmt == "csv":
-        content = _render_csv(headers, rows)
-        media_type = "text/csv"
-        ext = "csv"
+        # rows are sent while the cursor is still being read
+        content = participants_export_service.iter_csv(event)
     else:
-        content = _render_xlsx(headers, rows)
-        media_type = (
-            "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
-        ext = "xlsx"
+        fileobj = await participants_export_service.write_xlsx(event)
+        content = _iter_file(fileobj)
 
-    filename = f"event_{event.id}_participants.{ext}"
+    filename = participants_export_service.get_filename(event, fmt)
     return StreamingResponse(
-        io.BytesIO(content),
-        media_type=media_type,
+        content,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
@@ -2,13 +2,21 @@ from datetime import datetime, timezone
 
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
-from fastapi import APIRouter, Query
-from sqlalchemy import select, func
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from sqlalchemy import Select, and_, select, tuple_
+from sqlalchemy.orm import aliased
 
 from hack.core.models import Event, EventParticipant
-from hack.core.models.event import EventStatusEnum
+from hack.core.models.event import EventStatusEnum, compute_event_status
+from hack.core.providers import ReadOnlySession
 from hack.rest_server.models import AuthorizedUser
+from hack.rest_server.pagination import (
+    DEFAULT_PAGE_LIMIT,
+    NEXT_CURSOR_HEADER,
+    clamp_limit,
+    decode_cursor,
+    encode_cursor,
+)
 from hack.rest_server.schemas.events import EventCardDTO, \
     ParticipationStatusEnum
 
@@ -18,107 +26,172 @@ router = APIRouter(
 )
 
 
-async def _fetch_participants_count(
-        session: AsyncSession,
-        event_ids: list[int],
-) -> dict[int, int]:
-    if not event_ids:
-        return {}
-    stmt = (
-        select(
-            EventParticipant.event_id,
-            func.count(EventParticipant.id),
+# columns each card field is built from; `id` and `starts_at` are always
+# selected as they form the keyset
+_CARD_FIELD_COLUMNS = {
+    "name": (Event.name,),
+    "short_description": (Event.short_description,),
+    "description": (Event.description,),
+    "starts_at": (),
+    "ends_at": (Event.ends_at,),
+    "image_url": (Event.image_url,),
+    "participants_count": (Event.participants_count,),
+    "max_participants_count": (Event.max_participants_count,),
+    "payment_info": (Event.payment_info,),
+    "status": (Event.ends_at, Event.rejected_at),
+    "participation_status": (),
+}
+# fields of cards when none are requested
+DEFAULT_CARD_FIELDS = tuple(_CARD_FIELD_COLUMNS)
+_COMPUTED_CARD_FIELDS = {
+    "status",
+    "participation_status",
+}
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    if fields is None:
+        return list(DEFAULT_CARD_FIELDS)
+    requested = [i.strip() for i in fields.split(",") if i.strip()]
+    unknown = [
+        i for i in requested
+        if i not in _CARD_FIELD_COLUMNS and i != "id"
+    ]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}",
         )
-        .where(EventParticipant.event_id.in_(event_ids))
-        .where(
-            EventParticipant.status
-            == EventParticipant.ParticipationStatusEnum.PARTICIPATING
-        )
-        .group_by(EventParticipant.event_id)
-    )
-    result = await session.execute(stmt)
-    return {event_id: count for event_id, count in result.all()}
+    return [i for i in _CARD_FIELD_COLUMNS if i in requested]
 
 
-async def _fetch_user_participation(
-        session: AsyncSession,
-        event_ids: list[int],
+def build_event_cards_query(
+        selected_fields: list[str],
         user_id: int,
-) -> dict[int, EventParticipant.ParticipationStatusEnum]:
-    if not event_ids:
-        return {}
+        status_filter: EventStatusEnum | None,
+        after: tuple[datetime, int] | None,
+        limit: int,
+        now: datetime,
+) -> Select:
+    """ Page of cards, rejected events are never listed """
+
+    columns = [Event.id, Event.starts_at]
+    for field in selected_fields:
+        columns.extend(
+            column for column in _CARD_FIELD_COLUMNS[field]
+            if not any(column is i for i in columns)
+        )
+
     stmt = (
-        select(EventParticipant.event_id, EventParticipant.status)
-        .where(EventParticipant.event_id.in_(event_ids))
-        .where(EventParticipant.user_id == user_id)
+        select(*columns)
+        .select_from(Event)
+        .where(Event.rejected_at.is_(None))
+        .order_by(Event.starts_at, Event.id)
+        .limit(limit + 1)
     )
-    result = await session.execute(stmt)
-    return {event_id: status for event_id, status in result.all()}
+
+    # the caller's participation is joined in, so a page is assembled
+    # in a single round trip
+    if "participation_status" in selected_fields:
+        my_participation = aliased(EventParticipant)
+        stmt = (
+            stmt
+            .outerjoin(my_participation, and_(
+                my_participation.event_id == Event.id,
+                my_participation.user_id == user_id,
+            ))
+            .add_columns(
+                my_participation.status.label("participation_status"),
+            )
+        )
+
+    if status_filter is EventStatusEnum.PAST:
+        stmt = stmt.where(Event.ends_at <= now)
+    else:
+        stmt = stmt.where(Event.ends_at > now)
+
+    if after is not None:
+        stmt = stmt.where(tuple_(Event.starts_at, Event.id) > after)
+    return stmt
 
 
 @router.get(
     "",
     response_model=list[EventCardDTO],
+    response_model_exclude_unset=True,
 )
 @inject
 async def list_event_cards(
-    session: FromDishka[AsyncSession],
+    session: FromDishka[ReadOnlySession],
     authorized_user: FromDishka[AuthorizedUser],
+    response: Response,
     status_filter: EventStatusEnum | None = Query(
         default=None,
         alias="status",
     ),
+    limit: int = Query(
+        default=DEFAULT_PAGE_LIMIT,
+        description="Cards per page, the rest is behind `X-Next-Cursor`",
+    ),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(
+        default=None,
+        description="Comma separated card fields, all when omitted",
+    ),
 ) -> list[EventCardDTO]:
-    now = datetime.now(tz=timezone.utc)
-    stmt = (
-        select(Event)
-        .where(Event.rejected_at.is_(None))
-        .order_by(Event.starts_at, Event.id)
-    )
-
-    if status_filter in (None, EventStatusEnum.ACTIVE):
-        stmt = stmt.where(Event.ends_at > now)
-    elif status_filter is EventStatusEnum.REJECTED:
+    limit = clamp_limit(limit)
+    selected_fields = _parse_fields(fields)
+    if status_filter is EventStatusEnum.REJECTED:
         return []
-    elif status_filter is EventStatusEnum.PAST:
-        stmt = stmt.where(Event.ends_at <= now)
-
-    events = await session.scalars(stmt)
-    events = list(events.unique())
 
-    event_ids = [e.id for e in events]
-    participants_count = await _fetch_participants_count(session, event_ids)
-    user_participation = await _fetch_user_participation(
-        session,
-        event_ids,
-        authorized_user.id,
+    after = None
+    if cursor is not None:
+        after = decode_cursor(cursor, datetime, int)
+    stmt = build_event_cards_query(
+        selected_fields,
+        user_id=authorized_user.id,
+        status_filter=status_filter,
+        after=after,
+        limit=limit,
+        now=datetime.now(tz=timezone.utc),
     )
 
+    rows = list(await session.execute(stmt))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            rows[-1].starts_at,
+            rows[-1].id,
+        )
+
     cards: list[EventCardDTO] = []
-    for event in events:
-        participation_status = user_participation.get(event.id)
-        if participation_status is None:
-            participation_status_dto = ParticipationStatusEnum.NONE
-        elif participation_status == EventParticipant.ParticipationStatusEnum.PARTICIPATING:
-            participation_status_dto = ParticipationStatusEnum.PARTICIPATING
-        else:
-            participation_status_dto = ParticipationStatusEnum.REJECTED
-
-        cards.append(
-            EventCardDTO(
-                id=event.id,
-                name=event.name,
-                short_description=event.short_description,
-                description=event.description,
-                starts_at=event.starts_at,
-                ends_at=event.ends_at,
-                image_url=event.image_url,
-                participants_count=participants_count.get(event.id, 0),
-                max_participants_count=event.max_participants_count,
-                payment_info=event.payment_info,
-                status=event.status,
-                participation_status=participation_status_dto,
+    for row in rows:
+        values = {
+            field: getattr(row, field)
+            for field in selected_fields
+            if field not in _COMPUTED_CARD_FIELDS
+        }
+        if "status" in selected_fields:
+            values["status"] = compute_event_status(
+                row.ends_at,
+                row.rejected_at,
             )
-        )
+        if "participation_status" in selected_fields:
+            values["participation_status"] = _to_participation_status_dto(
+                row.participation_status,
+            )
+        cards.append(EventCardDTO(id=row.id, **values))
 
     return cards
+
+
+def _to_participation_status_dto(
+        participation_status: EventParticipant.ParticipationStatusEnum | None,
+) -> ParticipationStatusEnum:
+    if participation_status is None:
+        return ParticipationStatusEnum.NONE
+    if participation_status == (
+            EventParticipant.ParticipationStatusEnum.PARTICIPATING
+    ):
+        return ParticipationStatusEnum.PARTICIPATING
+    return ParticipationStatusEnum.REJECTED
@@ -0,0 +1,129 @@
+from dishka import FromDishka
+from dishka.integrations.fastapi import inject
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hack.core.models import Event, ExportJob, ExportJobStatusEnum
+from hack.core.services.export_jobs import ExportJobService
+from hack.core.services.participants_export import ParticipantsExportService
+from hack.core.services.uow_ctl import UoWCtl
+from hack.rest_server.models import AuthorizedAdministrator
+from hack.rest_server.schemas.export_jobs import (
+    CreateExportJobDTO,
+    ExportFormatEnum,
+    ExportJobDTO,
+)
+
+router = APIRouter()
+
+
+async def _build_export_job_dto(
+        job: ExportJob,
+        participants_export_service: ParticipantsExportService,
+) -> ExportJobDTO:
+    dto = ExportJobDTO.model_validate(job)
+    if job.status == ExportJobStatusEnum.DONE:
+        dto.download_url = (
+            await participants_export_service.get_download_url(job)
+        )
+    return dto
+
+
+async def _create_export_job(
+        session: AsyncSession,
+        uow_ctl: UoWCtl,
+        export_job_service: ExportJobService,
+        authorized_administrator: AuthorizedAdministrator,
+        event_ids: list[int],
+        fmt: ExportFormatEnum,
+) -> ExportJobDTO:
+    event_ids = sorted(set(event_ids))
+    found_ids = set(await session.scalars(
+        select(Event.id).where(Event.id.in_(event_ids))
+    ))
+    if len(found_ids) != len(event_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event not found",
+        )
+
+    job = await export_job_service.create(
+        requested_by_id=authorized_administrator.id,
+        event_ids=event_ids,
+        fmt=fmt.value,
+    )
+    await uow_ctl.commit()
+    return ExportJobDTO.model_validate(job)
+
+
+@router.post(
+    "/events/{event_id}/participants/export-jobs",
+    response_model=ExportJobDTO,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+@inject
+async def create_event_participants_export_job(
+        session: FromDishka[AsyncSession],
+        uow_ctl: FromDishka[UoWCtl],
+        export_job_service: FromDishka[ExportJobService],
+        authorized_administrator: FromDishka[AuthorizedAdministrator],
+        event_id: int,
+        fmt: ExportFormatEnum = Query(
+            default=ExportFormatEnum.CSV,
+            alias="format",
+        ),
+) -> ExportJobDTO:
+    return await _create_export_job(
+        session,
+        uow_ctl,
+        export_job_service,
+        authorized_administrator,
+        event_ids=[event_id],
+        fmt=fmt,
+    )
+
+
+@router.post(
+    "/export-jobs",
+    response_model=ExportJobDTO,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+@inject
+async def create_export_job(
+        session: FromDishka[AsyncSession],
+        uow_ctl: FromDishka[UoWCtl],
+        export_job_service: FromDishka[ExportJobService],
+        authorized_administrator: FromDishka[AuthorizedAdministrator],
+        payload: CreateExportJobDTO,
+) -> ExportJobDTO:
+    """ Export participants of many events, packed into a zip archive """
+
+    return await _create_export_job(
+        session,
+        uow_ctl,
+        export_job_service,
+        authorized_administrator,
+        event_ids=payload.event_ids,
+        fmt=payload.format,
+    )
+
+
+@router.get(
+    "/export-jobs/{job_id}",
+    response_model=ExportJobDTO,
+)
+@inject
+async def get_export_job(
+        session: FromDishka[AsyncSession],
+        participants_export_service: FromDishka[ParticipantsExportService],
+        authorized_administrator: FromDishka[AuthorizedAdministrator],
+        job_id: int,
+) -> ExportJobDTO:
+    job = await session.get(ExportJob, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found",
+        )
+    return await _build_export_job_dto(job, participants_export_service)
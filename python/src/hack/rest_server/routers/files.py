@@ -4,9 +4,8 @@ from pathlib import Path
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
 from fastapi import APIRouter, UploadFile, File
-from hack.core.providers import ConfigS3
+from hack.core.providers import ConfigS3, S3Client
 from hack.rest_server.models import AuthorizedUser
-from hack.rest_server.providers import S3Client
 from hack.rest_server.schemas.files import UploadFileResponseDTO
 
 router = APIRouter(
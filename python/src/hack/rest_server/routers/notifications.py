@@ -3,10 +3,11 @@ from datetime import datetime, timezone
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
 from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from hack.core.models.instant_notification import InstantNotification
+from hack.core.providers import ReadOnlySession
 from hack.core.services.uow_ctl import UoWCtl
 from hack.rest_server.models import AuthorizedUser
 from hack.rest_server.schemas.notifications import (
@@ -19,29 +20,43 @@ router = APIRouter(
 )
 
 
+def build_instant_notifications_query(
+        recipient_id: int,
+        include_acked: bool,
+        limit: int,
+        offset: int,
+) -> Select:
+    stmt = (
+        select(InstantNotification)
+        .where(InstantNotification.recipient_id == recipient_id)
+        .order_by(InstantNotification.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    if not include_acked:
+        stmt = stmt.where(InstantNotification.acked_at.is_(None))
+    return stmt
+
+
 @router.get(
     "/instant",
     response_model=list[InstantNotificationDTO],
 )
 @inject
 async def list_instant_notifications(
-        session: FromDishka[AsyncSession],
+        session: FromDishka[ReadOnlySession],
         authorized_user: FromDishka[AuthorizedUser],
         include_acked: bool = Query(default=False),
         limit: int = Query(default=50),
         offset: int = Query(default=0),
 ) -> list[InstantNotification]:
     limit = max(1, min(limit, 200))
-    stmt = (
-        select(InstantNotification)
-        .where(InstantNotification.recipient_id == authorized_user.id)
-        .order_by(InstantNotification.created_at.desc())
-        .limit(limit)
-        .offset(offset)
+    stmt = build_instant_notifications_query(
+        authorized_user.id,
+        include_acked=include_acked,
+        limit=limit,
+        offset=offset,
     )
-    if not include_acked:
-        stmt = stmt.where(InstantNotification.acked_at.is_(None))
-
     notifications = await session.scalars(stmt)
     return list(notifications)
 
@@ -1,6 +1,5 @@
 from datetime import datetime, timezone
 
-from argon2 import PasswordHasher
 from dishka import FromDishka
 from dishka.integrations.fastapi import inject
 from fastapi import APIRouter, HTTPException, status
@@ -9,6 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from hack.core.models import User, AdminSetPasswordNotification
 from hack.core.models.user import UserRoleEnum, UserStatusEnum
+from hack.core.providers import ReadOnlySession
+from hack.core.services.login_session_cache import LoginSessionCache
+from hack.core.services.password_hashing import PasswordHashingExecutor
 from hack.core.services.uow_ctl import UoWCtl
 from hack.rest_server.models import AuthorizedAdministrator
 from hack.rest_server.schemas.users import (
@@ -50,7 +52,7 @@ async def _get_user_or_404(
 )
 @inject
 async def list_users(
-    session: FromDishka[AsyncSession],
+    session: FromDishka[ReadOnlySession],
     authorized_administrator: FromDishka[AuthorizedAdministrator],
     limit: int = 50,
     full_name: str | None = None,
@@ -93,6 +95,7 @@ async def list_users(
 async def update_user(
     session: FromDishka[AsyncSession],
     uow_ctl: FromDishka[UoWCtl],
+    login_session_cache: FromDishka[LoginSessionCache],
     authorized_administrator: FromDishka[AuthorizedAdministrator],
     user_id: int,
     payload: UpdateUserDTO,
@@ -124,6 +127,7 @@ async def update_user(
 
     await session.flush()
     await uow_ctl.commit()
+    await login_session_cache.invalidate_user(user.id)
     return user
 
 
@@ -135,6 +139,7 @@ async def update_user(
 async def soft_delete_user(
     session: FromDishka[AsyncSession],
     uow_ctl: FromDishka[UoWCtl],
+    login_session_cache: FromDishka[LoginSessionCache],
     authorized_administrator: FromDishka[AuthorizedAdministrator],
     user_id: int,
 ) -> None:
@@ -142,6 +147,7 @@ async def soft_delete_user(
     user.deleted_at = datetime.now(tz=timezone.utc)
     await session.flush()
     await uow_ctl.commit()
+    await login_session_cache.invalidate_user(user.id)
     return None
 
 
@@ -153,7 +159,7 @@ async def soft_delete_user(
 async def reset_user_password(
     session: FromDishka[AsyncSession],
     notification_service: FromDishka[NotificationService],
-    ph: FromDishka[PasswordHasher],
+    ph: FromDishka[PasswordHashingExecutor],
     uow_ctl: FromDishka[UoWCtl],
     authorized_administrator: FromDishka[AuthorizedAdministrator],
     user_id: int,
@@ -167,7 +173,7 @@ async def reset_user_password(
             detail="Cannot reset password for deleted user",
         )
 
-    user.password_hash = ph.hash(payload.password)
+    user.password_hash = await ph.hash(payload.password)
     await session.flush()
 
     if payload.send_email:
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import EmailStr
+from pydantic import EmailStr, Field
 
 from .base import BaseDTO
 from ...core.models.user import UserRoleEnum
@@ -22,3 +22,14 @@ class ChangeUserRoleDTO(BaseDTO):
 
 class ExpireVerificationCodeDTO(BaseDTO):
     token: UUID
+
+
+class SeedExamplesDTO(BaseDTO):
+    users: int = Field(default=500, ge=1, le=10000)
+    events: int = Field(default=3000, ge=1, le=100000)
+    participations_per_user: int = Field(default=20, ge=0, le=100)
+    notifications_per_user: int = Field(default=20, ge=0, le=100)
+
+
+class DriftParticipantsCountDTO(BaseDTO):
+    delta: int
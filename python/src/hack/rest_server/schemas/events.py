@@ -7,6 +7,16 @@ from ...core.models.event import EventStatusEnum, EventParticipant
 from enum import StrEnum
 
 
+class EventsSortEnum(StrEnum):
+    ID = "id"
+    STARTS_AT = "starts_at"
+
+
+class SortOrderEnum(StrEnum):
+    ASC = "asc"
+    DESC = "desc"
+
+
 class ParticipationStatusEnum(StrEnum):
     NONE = "NONE"
     PARTICIPATING = EventParticipant.ParticipationStatusEnum.PARTICIPATING
@@ -59,22 +69,26 @@ class EventDTO(BaseDTO):
     created_at: datetime
     rejected_at: datetime | None
     status: EventStatusEnum
-    participants: list[EventParticipantDTO]
+    participants_count: int
+    # null when the listing is requested without participants
+    participants: list[EventParticipantDTO] | None = None
 
 
 class EventCardDTO(BaseDTO):
+    """ Every field but `id` may be left out with the `fields` projection """
+
     id: int
-    name: str
-    short_description: str | None
-    description: str
-    starts_at: datetime
-    ends_at: datetime
-    image_url: str
-    participants_count: int
-    max_participants_count: int | None
-    payment_info: str | None
-    status: EventStatusEnum
-    participation_status: ParticipationStatusEnum
+    name: str | None = None
+    short_description: str | None = None
+    description: str | None = None
+    starts_at: datetime | None = None
+    ends_at: datetime | None = None
+    image_url: str | None = None
+    participants_count: int | None = None
+    max_participants_count: int | None = None
+    payment_info: str | None = None
+    status: EventStatusEnum | None = None
+    participation_status: ParticipationStatusEnum | None = None
 
 
 class UpdateMyParticipationDTO(BaseDTO):
@@ -0,0 +1,28 @@
+from datetime import datetime
+from enum import StrEnum
+
+from pydantic import Field
+
+from ...core.models.export_job import ExportJobStatusEnum
+from .base import BaseDTO
+
+
+class ExportFormatEnum(StrEnum):
+    CSV = "csv"
+    XLSX = "xlsx"
+
+
+class CreateExportJobDTO(BaseDTO):
+    event_ids: list[int] = Field(min_length=1, max_length=1000)
+    format: ExportFormatEnum = ExportFormatEnum.CSV
+
+
+class ExportJobDTO(BaseDTO):
+    id: int
+    status: ExportJobStatusEnum
+    format: ExportFormatEnum
+    event_ids: list[int]
+    created_at: datetime
+    finished_at: datetime | None
+    error: str | None
+    download_url: str | None = None  # presigned, set once the job is done
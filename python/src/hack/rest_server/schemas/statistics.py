@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from .base import BaseDTO
 
 
@@ -43,3 +45,5 @@ class AdminStatisticsDTO(BaseDTO):
     scalars: list[ScalarMetricDTO]
     graphs: list[GraphDTO]
     histograms: list[HistogramDTO]
+    computed_at: datetime
+    snapshot_age_seconds: float  # zero when computed for this request
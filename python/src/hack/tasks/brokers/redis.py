@@ -15,6 +15,8 @@ from taskiq import (
     TaskiqMessage,
     BrokerMessage,
     TaskiqScheduler,
+    TaskiqEvents,
+    TaskiqState,
 )
 from taskiq.formatters.proxy_formatter import ProxyFormatter
 from taskiq.schedule_sources import LabelScheduleSource
@@ -25,9 +27,10 @@ from hack.core.providers import (
     ProviderConfig,
     ConfigRedis,
     ProviderRedis,
+    ProviderS3,
 )
 from hack.tasks.brokers.default import default_broker
-from hack.tasks.providers import ProviderBroker
+from hack.tasks.providers import ProviderBroker, ProviderSmtp
 
 
 class DishkaFormatter(ProxyFormatter):
@@ -39,6 +42,7 @@ class DishkaFormatter(ProxyFormatter):
 
 
 def make_worker_broker():
+    from hack.core.services.email_factory import EmailFactory
     from hack.core.services.providers import ProviderServices
     from hack.rest_server.models import AuthorizedUser
 
@@ -56,7 +60,9 @@ def make_worker_broker():
         ProviderConfig(),
         ProviderDatabase(),
         ProviderRedis(),
+        ProviderS3(),
         ProviderBroker(),
+        ProviderSmtp(),
         ProviderServices(),
         NoAuthorizedUser(),
         TaskiqProvider(),
@@ -80,6 +86,11 @@ def make_worker_broker():
     # setup DI for this broker
     setup_dishka(container=container, broker=broker)
 
+    @broker.on_event(TaskiqEvents.WORKER_STARTUP)
+    async def warm_up(state: TaskiqState) -> None:
+        email_factory = await container.get(EmailFactory)
+        email_factory.warm_up()
+
     return broker
 
 
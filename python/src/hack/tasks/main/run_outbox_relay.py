@@ -0,0 +1,51 @@
+import asyncio
+import logging
+
+from dishka import make_async_container
+from redis.asyncio import Redis as AsyncRedis
+from sqlalchemy.ext.asyncio import AsyncEngine
+from taskiq import AsyncBroker
+
+from hack.core.providers import (
+    ConfigOutbox,
+    ProviderConfig,
+    ProviderDatabase,
+    ProviderRedis,
+)
+from hack.core.services.outbox import OutboxRelayMetrics
+from hack.tasks.outbox_relay import OutboxRelay
+from hack.tasks.providers import ProviderBroker
+
+
+async def _run() -> None:
+    providers = (
+        ProviderConfig(),
+        ProviderDatabase(),
+        ProviderRedis(),
+        ProviderBroker(),
+    )
+    container = make_async_container(*providers)
+    try:
+        broker = await container.get(AsyncBroker)
+        await broker.startup()
+        relay = OutboxRelay(
+            config=await container.get(ConfigOutbox),
+            engine=await container.get(AsyncEngine),
+            broker=broker,
+            metrics=OutboxRelayMetrics(await container.get(AsyncRedis)),
+        )
+        try:
+            await relay.run()
+        finally:
+            await broker.shutdown()
+    finally:
+        await container.close()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
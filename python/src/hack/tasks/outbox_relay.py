@@ -0,0 +1,118 @@
+import asyncio
+from datetime import datetime, timezone
+from logging import getLogger
+
+from redis.exceptions import RedisError
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from taskiq import AsyncBroker
+from taskiq.kicker import AsyncKicker
+
+from hack.core.models import OutboxMessage
+from hack.core.providers import ConfigOutbox
+from hack.core.services.outbox import OutboxRelayMetrics
+
+logger = getLogger(__name__)
+
+
+class OutboxRelay:
+    """
+    Moves committed outbox messages to the task broker.
+
+    Rows are claimed with `FOR UPDATE SKIP LOCKED`, so several relays
+    may run side by side.  Delivery is at-least-once: a crash between
+    the broker write and the commit re-sends the claimed batch.  A
+    message the broker refused stays in the outbox for the next batch.
+    """
+
+    def __init__(
+            self,
+            config: ConfigOutbox,
+            engine: AsyncEngine,
+            broker: AsyncBroker,
+            metrics: OutboxRelayMetrics,
+    ):
+        self._config = config
+        self._engine = engine
+        self._broker = broker
+        self._metrics = metrics
+        self.relayed = 0
+        self.lag_seconds_max = 0.0
+
+    async def run(self) -> None:
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except Exception:
+                # database or broker outage, retry after the poll interval
+                logger.exception("Failed to relay outbox messages")
+                relayed = 0
+            if relayed < self._config.batch_size:
+                await asyncio.sleep(self._config.poll_interval)
+
+    async def relay_batch(self) -> int:
+        async with AsyncSession(self._engine) as session:
+            stmt = (
+                select(OutboxMessage)
+                .order_by(OutboxMessage.id)
+                .limit(self._config.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            messages = list(await session.scalars(stmt))
+            if not messages:
+                return 0
+            lag_seconds = self._lag_seconds(messages[0])
+
+            results = await asyncio.gather(
+                *(
+                    AsyncKicker(
+                        task_name=message.task_name,
+                        broker=self._broker,
+                        labels=message.labels,
+                    ).kiq(**message.kwargs)
+                    for message in messages
+                ),
+                return_exceptions=True,
+            )
+            message_ids = []
+            for message, result in zip(messages, results, strict=True):
+                if isinstance(result, Exception):
+                    logger.error(
+                        "Failed to kick outbox message %s (%s)",
+                        message.id,
+                        message.task_name,
+                        exc_info=result,
+                    )
+                else:
+                    message_ids.append(message.id)
+            if not message_ids:
+                return 0
+            await session.execute(
+                delete(OutboxMessage)
+                .where(OutboxMessage.id.in_(message_ids))
+            )
+            await session.commit()
+
+        self.relayed += len(message_ids)
+        self.lag_seconds_max = max(self.lag_seconds_max, lag_seconds)
+        try:
+            await self._metrics.record_batch(len(message_ids), lag_seconds)
+        except RedisError:
+            # the batch is delivered, losing its metrics must not stop relay
+            logger.exception("Failed to record outbox relay metrics")
+        logger.info(
+            "Relayed %s outbox messages, lag %.3fs (total %s, max lag %.3fs)",
+            len(message_ids),
+            lag_seconds,
+            self.relayed,
+            self.lag_seconds_max,
+        )
+        return len(message_ids)
+
+    @staticmethod
+    def _lag_seconds(message: OutboxMessage) -> float:
+        created_at = message.created_at
+        if created_at.tzinfo is None:
+            # column is stored without tz, values are written in UTC
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        return (datetime.now(tz=timezone.utc) - created_at).total_seconds()
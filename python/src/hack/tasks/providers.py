@@ -1,8 +1,11 @@
+from collections.abc import AsyncIterator
+
 from dishka import Provider, provide, Scope
 from taskiq import SimpleRetryMiddleware, AsyncBroker
 from taskiq_redis import ListQueueBroker
 
-from hack.core.providers import ConfigRedis
+from hack.core.providers import ConfigEmail, ConfigRedis
+from hack.tasks.smtp_pool import SmtpConnectionPool
 
 
 class ProviderBroker(Provider):
@@ -19,3 +22,14 @@ class ProviderBroker(Provider):
             .with_middlewares(SimpleRetryMiddleware(default_retry_count=3))
         )
         return broker
+
+
+class ProviderSmtp(Provider):
+    @provide(scope=Scope.APP)
+    async def get_smtp_connection_pool(
+            self,
+            config_email: ConfigEmail,
+    ) -> AsyncIterator[SmtpConnectionPool]:
+        pool = SmtpConnectionPool(config_email)
+        yield pool
+        await pool.close()
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from email.message import EmailMessage
+from logging import getLogger
+
+import aiosmtplib
+
+from hack.core.providers import ConfigEmail
+
+logger = getLogger(__name__)
+
+
+class _PooledConnection:
+    def __init__(self, smtp: aiosmtplib.SMTP):
+        self.smtp = smtp
+        self.messages_sent = 0
+        self.released_at = time.monotonic()
+
+
+class SmtpConnectionPool:
+    """
+    Keeps authenticated SMTP connections open between deliveries.
+
+    At most `pool_size` connections are in use at once.  Connections
+    idle for longer than `pool_idle_timeout` or that have sent
+    `pool_max_messages` messages are closed instead of being reused.
+    A send that fails on a dropped connection is retried once on a
+    fresh one.
+    """
+
+    def __init__(self, config: ConfigEmail):
+        self._config = config
+        self._semaphore = asyncio.Semaphore(config.pool_size)
+        self._idle: list[_PooledConnection] = []
+        self.connections_opened = 0
+        self.messages_sent = 0
+
+    async def send_message(self, message: EmailMessage) -> None:
+        async with self._semaphore:
+            connection = await self._acquire()
+            try:
+                await connection.smtp.send_message(message)
+            except aiosmtplib.SMTPServerDisconnected:
+                logger.info("SMTP connection dropped, reconnecting")
+                await self._discard(connection)
+                connection = await self._connect()
+                try:
+                    await connection.smtp.send_message(message)
+                except BaseException:
+                    await self._discard(connection)
+                    raise
+            except BaseException:
+                await self._discard(connection)
+                raise
+            connection.messages_sent += 1
+            self.messages_sent += 1
+            await self._release(connection)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await self._discard(connection)
+
+    async def _acquire(self) -> _PooledConnection:
+        now = time.monotonic()
+        while self._idle:
+            connection = self._idle.pop()
+            expired = (
+                now - connection.released_at > self._config.pool_idle_timeout
+            )
+            if expired or not connection.smtp.is_connected:
+                await self._discard(connection)
+                continue
+            return connection
+        return await self._connect()
+
+    async def _release(self, connection: _PooledConnection) -> None:
+        if connection.messages_sent >= self._config.pool_max_messages:
+            await self._discard(connection)
+            return
+        connection.released_at = time.monotonic()
+        self._idle.append(connection)
+
+    async def _connect(self) -> _PooledConnection:
+        smtp = aiosmtplib.SMTP(
+            hostname=self._config.host,
+            port=self._config.port,
+            username=self._config.username,
+            password=self._config.password,
+            start_tls=self._config.start_tls,
+            use_tls=self._config.use_tls,
+            timeout=self._config.timeout,
+        )
+        await smtp.connect()
+        self.connections_opened += 1
+        return _PooledConnection(smtp=smtp)
+
+    @staticmethod
+    async def _discard(connection: _PooledConnection) -> None:
+        if not connection.smtp.is_connected:
+            return
+        try:
+            await connection.smtp.quit()
+        except (aiosmtplib.SMTPException, OSError):
+            connection.smtp.close()
@@ -1,13 +1,13 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
 from logging import getLogger
 
 from dishka import FromDishka
 from dishka.integrations.taskiq import inject
-from sqlalchemy import select
+from sqlalchemy import Update, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from hack.core.models import Event, EventParticipant
 from hack.core.models.notification_events import EventReminderNotification
@@ -17,6 +17,11 @@ from hack.tasks.brokers.default import default_broker
 
 logger = getLogger(__name__)
 
+# participants claimed and committed together
+REMINDER_CHUNK_SIZE = 500
+# participants processed per tick, the rest is picked up by the next ticks
+REMINDER_TICK_BUDGET = 5000
+
 
 @default_broker.task(schedule=[{"cron": "*/1 * * * *"}])
 @inject(patch_module=True)
@@ -25,48 +30,99 @@ async def queue_event_reminders(
         notification_service: FromDishka[NotificationService],
         uow_ctl: FromDishka[UoWCtl],
 ) -> None:
+    """
+    Claim pending reminders and fan them out.
+
+    Claiming locks rows with `SKIP LOCKED` and rechecks
+    `reminder_queued_at`, so concurrent ticks never queue a reminder
+    twice.  Each chunk is committed on its own to keep locks short.
+    """
+
     logger.info("Performing scheduled revision of event reminders")
     now = datetime.now(tz=timezone.utc)
     horizon = now + timedelta(hours=24)
 
-    stmt = (
-        select(EventParticipant)
-        .join(Event)
-        .options(
-            (selectinload(EventParticipant.event)
-             .selectinload(Event.participants)),
-            selectinload(EventParticipant.user),
+    queued = 0
+    while queued < REMINDER_TICK_BUDGET:
+        chunk_size = min(REMINDER_CHUNK_SIZE, REMINDER_TICK_BUDGET - queued)
+        claimed = await _queue_reminders_chunk(
+            session,
+            notification_service,
+            now=now,
+            horizon=horizon,
+            limit=chunk_size,
         )
+        await uow_ctl.commit()
+        queued += claimed
+        if claimed < chunk_size:
+            break
+
+    if queued:
+        logger.info("Queued %s event reminders", queued)
+
+
+def build_reminders_claim(
+        now: datetime,
+        horizon: datetime,
+        limit: int,
+) -> Update:
+    """ Marks pending reminders of events starting until `horizon` """
+
+    pending_ids = (
+        select(EventParticipant.id)
+        .join(Event)
         .where(EventParticipant.status
                == EventParticipant.ParticipationStatusEnum.PARTICIPATING)
         .where(EventParticipant.reminder_queued_at.is_(None))
         .where(Event.rejected_at.is_(None))
         .where(Event.starts_at <= horizon)
         .where(Event.starts_at >= now)
+        .order_by(EventParticipant.id)
+        .limit(limit)
+        .with_for_update(of=EventParticipant, skip_locked=True)
     )
-    participants = list(await session.scalars(stmt))
-    if not participants:
-        return
-
-    for participant in participants:
-        event = participant.event
-        participants_count = sum(
-            1
-            for p in event.participants
-            if p.status == EventParticipant.ParticipationStatusEnum.PARTICIPATING
-        )
+    claim_stmt = (
+        update(EventParticipant)
+        .where(EventParticipant.id.in_(pending_ids.scalar_subquery()))
+        .where(EventParticipant.reminder_queued_at.is_(None))
+        .values(reminder_queued_at=now)
+        .returning(EventParticipant.event_id, EventParticipant.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    return claim_stmt
+
+
+async def _queue_reminders_chunk(
+        session: AsyncSession,
+        notification_service: NotificationService,
+        now: datetime,
+        horizon: datetime,
+        limit: int,
+) -> int:
+    claim_stmt = build_reminders_claim(now, horizon, limit)
+    claimed = (await session.execute(claim_stmt)).all()
+    if not claimed:
+        return 0
+
+    recipients_by_event: defaultdict[int, list[int]] = defaultdict(list)
+    for event_id, user_id in claimed:
+        recipients_by_event[event_id].append(user_id)
+    event_ids = list(recipients_by_event)
+
+    events = await session.scalars(
+        select(Event).where(Event.id.in_(event_ids))
+    )
+    # one render per event, greetings are filled per recipient
+    for event in events:
         await notification_service.notify_about_event(
             EventReminderNotification(
                 event_name=event.name,
                 starts_at=event.starts_at,
                 location=event.location,
                 event_id=event.id,
-                participants_count=participants_count,
-                recipient_name=participant.user.full_name,
+                participants_count=event.participants_count,
             ),
-            recipients_ids=[participant.user_id],
+            recipients_ids=recipients_by_event[event.id],
+            personalized=True,
         )
-        participant.reminder_queued_at = now
-
-    await session.flush()
-    await uow_ctl.commit()
+    return len(claimed)
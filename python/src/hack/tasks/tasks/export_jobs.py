@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+from logging import getLogger
+
+from dishka import FromDishka
+from dishka.integrations.taskiq import inject
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from hack.core.models import ExportJob, ExportJobStatusEnum
+from hack.core.services.participants_export import ParticipantsExportService
+from hack.core.services.uow_ctl import UoWCtl
+from hack.tasks.brokers.default import default_broker
+
+logger = getLogger(__name__)
+
+
+@default_broker.task()
+@inject(patch_module=True)
+async def run_export_job(
+        job_id: int,
+        session: FromDishka[AsyncSession],
+        participants_export_service: FromDishka[ParticipantsExportService],
+        uow_ctl: FromDishka[UoWCtl],
+) -> None:
+    job = await session.get(ExportJob, job_id)
+    if job is None or job.status == ExportJobStatusEnum.DONE:
+        return
+
+    job.status = ExportJobStatusEnum.RUNNING
+    await uow_ctl.commit()
+
+    try:
+        job.s3_key = await participants_export_service.run_job(job)
+    except Exception as e:
+        logger.exception("Export job failed; job_id=%s", job_id)
+        await uow_ctl.rollback()
+        job.status = ExportJobStatusEnum.FAILED
+        job.error = str(e) or type(e).__name__
+    else:
+        job.status = ExportJobStatusEnum.DONE
+    job.finished_at = datetime.now(tz=timezone.utc)
+    await uow_ctl.commit()
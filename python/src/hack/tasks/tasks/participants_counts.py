@@ -0,0 +1,26 @@
+from logging import getLogger
+
+from dishka import FromDishka
+from dishka.integrations.taskiq import inject
+
+from hack.core.services.event_participants import EventParticipantsService
+from hack.core.services.uow_ctl import UoWCtl
+from hack.tasks.brokers.default import default_broker
+
+logger = getLogger(__name__)
+
+
+@default_broker.task(schedule=[{"cron": "17 * * * *"}])
+@inject(patch_module=True)
+async def reconcile_participants_counts(
+        event_participants_service: FromDishka[EventParticipantsService],
+        uow_ctl: FromDishka[UoWCtl],
+) -> None:
+    logger.info("Reconciling events participants counters")
+    fixed_event_ids = await event_participants_service.reconcile()
+    await uow_ctl.commit()
+    if fixed_event_ids:
+        logger.warning(
+            "Participants counters drifted and were fixed; event_ids=%s",
+            fixed_event_ids,
+        )
@@ -2,13 +2,15 @@ import logging
 from email.message import EmailMessage
 from typing import Annotated
 
-import aiosmtplib
 from dishka import FromDishka
 from dishka.integrations.taskiq import inject
 from taskiq import Context, TaskiqDepends
 
+from hack.core.models.notification_events import RenderedEmail
 from hack.core.providers import ConfigEmail
+from hack.core.services.email_factory import personalize_email
 from hack.tasks.brokers.default import default_broker
+from hack.tasks.smtp_pool import SmtpConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -18,10 +20,98 @@ logger = logging.getLogger(__name__)
 async def send_email(
         context: Annotated[Context, TaskiqDepends()],
         email_config: FromDishka[ConfigEmail],
+        smtp_pool: FromDishka[SmtpConnectionPool],
         to_email: str,
         subject: str,
         content: str,
         html_content: str | None = None,
+) -> None:
+    await _deliver(
+        email_config,
+        smtp_pool,
+        to_email=to_email,
+        subject=subject,
+        content=content,
+        html_content=html_content,
+        task_id=context.message.task_id,
+    )
+
+
+@default_broker.task()
+@inject(patch_module=True)
+async def send_email_batch(
+        context: Annotated[Context, TaskiqDepends()],
+        email_config: FromDishka[ConfigEmail],
+        smtp_pool: FromDishka[SmtpConnectionPool],
+        recipients: list[str],
+        subject: str,
+        content: str,
+        html_content: str | None = None,
+        recipient_names: list[str | None] | None = None,
+) -> None:
+    """
+    Deliver one rendered email to a chunk of recipients.
+
+    With `recipient_names`, the body is a shared render and its greeting
+    is filled per recipient.  Recipients that failed are re-queued one
+    by one as `send_email`, so retries never resend to the part of the
+    chunk that was delivered.
+    """
+
+    task_id = context.message.task_id
+    shared_email = RenderedEmail(
+        subject=subject,
+        content=content,
+        html_content=html_content or "",
+    )
+    failed: list[tuple[str, RenderedEmail]] = []
+    for i, to_email in enumerate(recipients):
+        rendered_email = shared_email
+        if recipient_names is not None:
+            rendered_email = personalize_email(
+                shared_email,
+                recipient_names[i],
+            )
+        try:
+            await _deliver(
+                email_config,
+                smtp_pool,
+                to_email=to_email,
+                subject=rendered_email.subject,
+                content=rendered_email.content,
+                html_content=rendered_email.html_content or None,
+                task_id=task_id,
+            )
+        except Exception:
+            logger.exception(
+                "Email delivery failed, will retry separately; "
+                "to=%s task_id=%s",
+                to_email,
+                task_id,
+            )
+            failed.append((to_email, rendered_email))
+
+    for to_email, rendered_email in failed:
+        await (
+            send_email.kicker()
+            .with_broker(context.broker)
+            .kiq(
+                to_email=to_email,
+                subject=rendered_email.subject,
+                content=rendered_email.content,
+                html_content=rendered_email.html_content or None,
+            )
+        )
+
+
+async def _deliver(
+        email_config: ConfigEmail,
+        smtp_pool: SmtpConnectionPool,
+        to_email: str,
+        subject: str,
+        content: str,
+        html_content: str | None,
+        task_id: str,
 ) -> None:
     message = EmailMessage()
     message["To"] = to_email
@@ -32,7 +122,6 @@ async def send_email(
     if html_content:
         message.add_alternative(html_content, subtype="html")
 
-    task_id = context.message.task_id
     if email_config.backend == "console":
         logger.info(
             "Email queued (console backend); to=%s subject=%s task_id=%s",
@@ -51,13 +140,4 @@ async def send_email(
         )
         return
 
-    await aiosmtplib.send(
-        message,
-        hostname=email_config.host,
-        port=email_config.port,
-        username=email_config.username,
-        password=email_config.password,
-        start_tls=email_config.start_tls,
-        use_tls=email_config.use_tls,
-        timeout=email_config.timeout,
-    )
+    await smtp_pool.send_message(message)
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+from logging import getLogger
+
+from dishka import FromDishka
+from dishka.integrations.taskiq import inject
+
+from hack.core.services.statistics import StatisticsService
+from hack.core.services.statistics_counters import StatisticsCountersService
+from hack.core.services.uow_ctl import UoWCtl
+from hack.tasks.brokers.default import default_broker
+
+logger = getLogger(__name__)
+
+
+@default_broker.task(schedule=[{"cron": "*/1 * * * *"}])
+@inject(patch_module=True)
+async def refresh_statistics_snapshot(
+        statistics_service: FromDishka[StatisticsService],
+        uow_ctl: FromDishka[UoWCtl],
+) -> None:
+    logger.info("Refreshing statistics snapshot")
+    await statistics_service.refresh_admin_snapshot()
+    await uow_ctl.commit()
+
+
+@default_broker.task(schedule=[{"cron": "*/1 * * * *"}])
+@inject(patch_module=True)
+async def roll_over_statistics(
+        statistics_counters_service: FromDishka[StatisticsCountersService],
+        uow_ctl: FromDishka[UoWCtl],
+) -> None:
+    """ Move events which have ended from active to past counters """
+
+    now = datetime.now(tz=timezone.utc)
+    batch_size = StatisticsCountersService.ROLL_OVER_BATCH_SIZE
+    rolled_over = 0
+    while True:
+        count = await statistics_counters_service.roll_over(now)
+        await uow_ctl.commit()
+        rolled_over += count
+        if count < batch_size:
+            break
+    if rolled_over:
+        logger.info("Events counted as past; count=%s", rolled_over)
+
+
+@default_broker.task(schedule=[{"cron": "43 * * * *"}])
+@inject(patch_module=True)
+async def check_statistics_counters(
+        statistics_counters_service: FromDishka[StatisticsCountersService],
+        uow_ctl: FromDishka[UoWCtl],
+) -> None:
+    logger.info("Checking statistics counters")
+    mismatches = await statistics_counters_service.check()
+    if not mismatches:
+        return
+    logger.warning(
+        "Statistics counters drifted and are rebuilt; mismatches=%s",
+        mismatches,
+    )
+    await statistics_counters_service.rebuild()
+    await uow_ctl.commit()